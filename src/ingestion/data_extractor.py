@@ -5,8 +5,201 @@ Implements the Bronze layer extraction with zero interpretation
 """
 
 from bs4 import BeautifulSoup
+from selectolax.lexbor import LexborHTMLParser, LexborNode
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+import ahocorasick
+import bisect
+from datetime import datetime
+import hashlib
+import orjson
+import os
 import re
-from typing import Dict, List, Optional, Tuple
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+try:
+    import re2
+except ImportError:  # RE2 is optional; the stdlib engine handles everything when it's missing
+    re2 = None
+
+if re2 is not None:
+    _RE2_OPTIONS = re2.Options()
+    _RE2_OPTIONS.log_errors = False
+    
+    # Every character stdlib re's \s matches in a str pattern (&nbsp;, em spaces, ...);
+    # RE2's \s is ASCII-only, so patterns get this class spelled out before compiling
+    _UNICODE_SPACE = ''.join(f'\\x{{{code:x}}}' for code in range(0x110000) if chr(code).isspace())
+
+def _unicode_whitespace(pattern: str) -> str:
+    """pattern with its whitespace escapes (\\s, and \\S outside a class) spelled out as re matches them"""
+    out = []
+    in_class = False
+    i = 0
+    while i < len(pattern):
+        char = pattern[i]
+        if char == '\\' and i + 1 < len(pattern):
+            escape = pattern[i:i + 2]
+            if escape == '\\s':
+                out.append(_UNICODE_SPACE if in_class else f'[{_UNICODE_SPACE}]')
+            elif escape == '\\S' and not in_class:
+                out.append(f'[^{_UNICODE_SPACE}]')
+            else:
+                out.append(escape)
+            i += 2
+            continue
+        if char == '[':
+            in_class = True
+        elif char == ']':
+            in_class = False
+        out.append(char)
+        i += 1
+    return ''.join(out)
+
+def _compile_fast(pattern: str):
+    """
+    Compile with RE2 (linear-time DFA) when available
+    Falls back to re for patterns RE2 rejects or when RE2 isn't installed
+    """
+    if re2 is not None:
+        try:
+            return re2.compile(_unicode_whitespace(pattern), _RE2_OPTIONS)
+        except re2.error:
+            pass
+    return re.compile(pattern)
+
+# Extraction patterns with context preservation, compiled once at import
+_RAW_PATTERNS = {
+    'thc_content': [
+        r'THC:?\s*([^\n\.]+?)(?:\.|\n|$)',
+        r'(?:THC|thc)\s*(?:content|level|percentage)?:?\s*([^\n\.]+?)(?:\.|\n|$)',
+        r'([0-9]+(?:\.[0-9]+)?(?:\s*-\s*[0-9]+(?:\.[0-9]+)?)?\s*%\s*THC)'
+    ],
+    'cbd_content': [
+        r'CBD:?\s*([^\n\.]+?)(?:\.|\n|$)',
+        r'(?:CBD|cbd)\s*(?:content|level|percentage)?:?\s*([^\n\.]+?)(?:\.|\n|$)',
+        r'([0-9]+(?:\.[0-9]+)?(?:\s*-\s*[0-9]+(?:\.[0-9]+)?)?\s*%\s*CBD)'
+    ],
+    'flowering_time': [
+        r'(?:flowering|flower)\s+(?:time|period):?\s*([^\n\.]+?)(?:\.|\n|$)',
+        r'(?:blooms?|flowers?)\s+(?:in|for|after)\s*([^\n\.]+?)(?:\.|\n|$)',
+        r'([0-9]+(?:\s*-\s*[0-9]+)?\s*(?:weeks?|days?|wks?)\s*(?:flowering|flower|bloom))'
+    ],
+    'height': [
+        r'(?:height|tall|grows?):?\s*([^\n\.]+?)(?:\.|\n|$)',
+        r'(?:reaches|up to|grows to)\s*([^\n\.]+?)(?:\.|\n|$)',
+        r'([0-9]+(?:\s*-\s*[0-9]+)?\s*(?:cm|feet?|ft|inches?|in)\s*(?:tall|high|height))'
+    ],
+    'yield': [
+        r'(?:yield|harvest|produces?):?\s*([^\n\.]+?)(?:\.|\n|$)',
+        r'(?:up to|around|approximately)\s*([^\n\.]+?)(?:\.|\n|$)',
+        r'([0-9]+(?:\s*-\s*[0-9]+)?\s*(?:g|grams?|oz|ounces?)\s*(?:per|/|m2|plant))'
+    ],
+    'genetics': [
+        r'(?:genetics|lineage|cross|bred from):?\s*([^\n\.]+?)(?:\.|\n|$)',
+        r'([0-9]+\s*%\s*(?:sativa|indica)(?:\s*[^\n\.]*?)?)(?:\.|\n|$)',
+        r'(?:hybrid|cross)\s+(?:of|between)\s*([^\n\.]+?)(?:\.|\n|$)'
+    ]
+}
+
+_PATTERNS = {
+    field_name: [_compile_fast(f'(?im){pattern}') for pattern in field_patterns]
+    for field_name, field_patterns in _RAW_PATTERNS.items()
+}
+
+# Fields pattern matching can fill, in pattern-table order
+_TARGET_FIELDS = tuple(_PATTERNS)
+
+_SENTENCE_SPLIT_RE = re.compile(r'[.!?]+')
+
+# Description keywords by context category, matched with a single automaton
+_CONTEXT_KEYWORDS = {
+    'effects': ['relaxing', 'euphoric', 'uplifting', 'energetic', 'creative', 'focused', 'happy', 'sleepy'],
+    'flavors': ['citrus', 'lemon', 'berry', 'sweet', 'earthy', 'pine', 'diesel', 'fruity'],
+    'growing': ['indoor', 'outdoor', 'hydro', 'soil', 'climate', 'temperature']
+}
+_CONTEXT_ORDER = {category: idx for idx, category in enumerate(_CONTEXT_KEYWORDS)}
+
+_CONTEXT_AUTOMATON = ahocorasick.Automaton()
+for _category, _keywords in _CONTEXT_KEYWORDS.items():
+    for _keyword in _keywords:
+        _CONTEXT_AUTOMATON.add_word(_keyword, _category)
+_CONTEXT_AUTOMATON.make_automaton()
+
+# Specification table detection: any two distinct keywords qualify
+_SPEC_KEYWORD_RE = re.compile(r'thc|cbd|flowering|height|yield|genetics|sativa|indica', re.IGNORECASE)
+
+# Common selectors for product descriptions, most specific first
+_DESC_SELECTORS = [
+    '.product-description',
+    '.strain-description',
+    '.description',
+    '.product-details',
+    '.strain-info',
+    '.product-content',
+    '[class*="description"]',
+    '[class*="details"]'
+]
+_DESC_SELECTOR = ', '.join(_DESC_SELECTORS)
+
+# Visual indicator selectors; the ` i` flag keeps class matching case-insensitive
+_RATING_SELECTOR = ','.join(
+    f'{tag}[class*={keyword} i]'
+    for tag in ('img', 'span', 'div')
+    for keyword in ('star', 'rating', 'score')
+)
+_STAR_SELECTOR = '[class*=star i]'
+_DIFFICULTY_SELECTOR = ','.join(
+    f'[class*={keyword} i]' for keyword in ('difficulty', 'easy', 'hard', 'beginner')
+)
+
+# Table header keywords by standard field name, checked in order
+_FIELD_MAPPINGS = {
+    'thc': ['thc', 'thc content', 'thc level', 'thc %', 'thc percentage'],
+    'cbd': ['cbd', 'cbd content', 'cbd level', 'cbd %', 'cbd percentage'],
+    'flowering_time': ['flowering time', 'flowering period', 'flower time', 'bloom time', 'flowering'],
+    'height': ['height', 'plant height', 'size', 'grows to', 'tall'],
+    'yield': ['yield', 'harvest', 'production', 'output'],
+    'genetics': ['genetics', 'genetic background', 'lineage', 'breeding', 'cross'],
+    'effects': ['effects', 'effect', 'high', 'buzz'],
+    'flavors': ['flavor', 'flavour', 'taste', 'aroma', 'smell']
+}
+
+# Keywords that contain another keyword of the same field can never decide a substring match
+_FIELD_SCAN_KEYWORDS = [
+    (field_name, [kw for kw in keywords if not any(other != kw and other in kw for other in keywords)])
+    for field_name, keywords in _FIELD_MAPPINGS.items()
+]
+
+def _scan_field_keywords(key_lower: str) -> Optional[str]:
+    """Return the first field with a keyword contained in the header text"""
+    for field_name, keywords in _FIELD_SCAN_KEYWORDS:
+        if any(keyword in key_lower for keyword in keywords):
+            return field_name
+    return None
+
+# Exact header -> field lookups, resolved through the same scan so both paths agree
+_KEY_TO_FIELD = {
+    keyword: _scan_field_keywords(keyword)
+    for keywords in _FIELD_MAPPINGS.values()
+    for keyword in keywords
+}
+
+@lru_cache(maxsize=None)
+def _fused_pattern(field_names: Tuple[str, ...]):
+    """
+    Union of every pattern for the given fields, scanned in a single pass
+    A field's later (more specific) patterns are tried first at each position
+    """
+    alternatives = [
+        f'(?P<{field_name}__{idx}>{pattern})'
+        for field_name in field_names
+        for idx, pattern in reversed(list(enumerate(_RAW_PATTERNS[field_name])))
+    ]
+    return _compile_fast('(?im)' + '|'.join(alternatives))
+
+# Extraction results kept per extractor, keyed by a digest of the page HTML
+_RESULT_CACHE_SIZE = 4096
 
 class CannabisDataExtractor:
     """
@@ -21,124 +214,400 @@ class CannabisDataExtractor:
             'patterns_matched': 0,
             'images_processed': 0
         }
+        self._result_cache = OrderedDict()
     
     def extract_strain_data(self, html_content: str, source_url: str) -> Dict:
         """
         Main extraction method that applies all extraction techniques
         Returns Bronze layer data (verbatim, zero interpretation)
         """
-        soup = BeautifulSoup(html_content, 'html.parser')
+        # Identical HTML (retries, re-runs) reuses the earlier extraction
+        digest = hashlib.blake2b(html_content.encode('utf-8', 'ignore'), digest_size=16).digest()
+        cached = self._result_cache.get(digest)
+        if cached is None:
+            cached = self._extract_raw_data(html_content)
+            self._result_cache[digest] = cached
+            if len(self._result_cache) > _RESULT_CACHE_SIZE:
+                self._result_cache.popitem(last=False)
+        else:
+            self._result_cache.move_to_end(digest)
         
-        extracted_data = {
+        raw_data, stats_hit = cached
+        for stat_name in stats_hit:
+            self.extraction_stats[stat_name] += 1
+        
+        return {
             'source_url': source_url,
             'extraction_timestamp': self._get_timestamp(),
-            'raw_data': {}
+            'raw_data': dict(raw_data)
         }
+    
+    def extract_many(self, pages: Iterable[Tuple[str, str]], workers: Optional[int] = None) -> Iterator[Dict]:
+        """
+        Extract many (html_content, source_url) pages across worker processes
+        Yields results in input order and folds worker stats into this extractor
+        """
+        with ProcessPoolExecutor(max_workers=workers or os.cpu_count()) as executor:
+            # Chunking amortizes the pickling cost of shipping pages to workers
+            for extracted_data, stats in executor.map(_extract_one, pages, chunksize=32):
+                for stat_name, count in stats.items():
+                    self.extraction_stats[stat_name] += count
+                yield extracted_data
+    
+    def _extract_raw_data(self, html_content: str) -> Tuple[Dict, Tuple[str, ...]]:
+        """
+        Run every extraction technique over one page
+        Returns the raw data and the extraction stats the page contributes to
+        """
+        tree = self._parse(html_content)
+        
+        raw_data = {}
+        stats_hit = []
         
+        # Each phase writes straight into raw_data; later phases win on shared keys
         # Extract from structured tables (highest priority)
-        table_data = self._extract_from_tables(soup)
-        if table_data:
-            extracted_data['raw_data'].update(table_data)
-            self.extraction_stats['tables_found'] += 1
+        if self._extract_from_tables(tree, raw_data):
+            stats_hit.append('tables_found')
         
         # Extract from product descriptions
-        desc_data = self._extract_from_descriptions(soup)
-        if desc_data:
-            extracted_data['raw_data'].update(desc_data)
-            self.extraction_stats['descriptions_found'] += 1
+        if self._extract_from_descriptions(tree, raw_data):
+            stats_hit.append('descriptions_found')
         
-        # Extract using pattern matching
-        pattern_data = self._extract_with_patterns(soup)
-        if pattern_data:
-            extracted_data['raw_data'].update(pattern_data)
-            self.extraction_stats['patterns_matched'] += 1
+        # Extract using pattern matching, only for fields earlier phases left unfilled
+        present = {key[:-4] for key in raw_data if key.endswith('_raw')}
+        missing = tuple(field_name for field_name in _TARGET_FIELDS if field_name not in present)
+        if missing:
+            page_text = self._page_text(tree)
+            if self._extract_with_patterns(tree, page_text, raw_data, missing):
+                stats_hit.append('patterns_matched')
         
         # Extract from images and icons
-        image_data = self._extract_from_images(soup)
-        if image_data:
-            extracted_data['raw_data'].update(image_data)
-            self.extraction_stats['images_processed'] += 1
+        if self._extract_from_images(tree, raw_data):
+            stats_hit.append('images_processed')
         
         # Extract metadata
-        meta_data = self._extract_metadata(soup)
-        if meta_data:
-            extracted_data['raw_data'].update(meta_data)
+        self._extract_metadata(tree, raw_data)
         
-        return extracted_data
+        return raw_data, tuple(stats_hit)
+    
+    def _parse(self, html_content: str) -> LexborHTMLParser:
+        """
+        Parse HTML with the C-backed lexbor engine
+        Falls back to BeautifulSoup to repair markup lexbor refuses to load
+        """
+        try:
+            return LexborHTMLParser(html_content)
+        except (TypeError, ValueError):
+            return LexborHTMLParser(str(BeautifulSoup(html_content, 'lxml')))
     
-    def _extract_from_tables(self, soup: BeautifulSoup) -> Dict:
+    def _extract_from_tables(self, tree: LexborHTMLParser, out: Dict) -> bool:
         """
         Extract data from HTML tables - highest priority source
-        Returns verbatim text as found in tables
+        Writes verbatim text as found in tables into out; returns whether any was found
         """
-        table_data = {}
+        found = False
         
         # Find all tables
-        tables = soup.find_all('table')
+        tables = tree.css('table')
         
         for table_idx, table in enumerate(tables):
             # Look for specification tables
             if self._is_specification_table(table):
-                rows = table.find_all('tr')
+                rows = table.css('tr')
                 
                 for row in rows:
-                    cells = row.find_all(['td', 'th'])
+                    cells = row.css('td, th')
                     if len(cells) >= 2:
                         # Extract key-value pairs verbatim
-                        key_cell = cells[0].get_text(strip=True)
-                        value_cell = cells[1].get_text(strip=True)
+                        key_cell = cells[0].text(strip=True)
+                        value_cell = cells[1].text(strip=True)
                         
                         if key_cell and value_cell:
                             # Map to standard field names while preserving original text
                             field_name = self._map_table_field(key_cell)
                             if field_name:
-                                table_data[f"{field_name}_raw"] = value_cell
-                                table_data[f"{field_name}_source"] = f"Table {table_idx + 1}"
+                                out[f"{field_name}_raw"] = value_cell
+                                out[f"{field_name}_source"] = f"Table {table_idx + 1}"
+                                found = True
         
-        return table_data
+        return found
     
-    def _extract_from_descriptions(self, soup: BeautifulSoup) -> Dict:
+    def _extract_from_descriptions(self, tree: LexborHTMLParser, out: Dict) -> bool:
         """
         Extract data from product descriptions and text content
         Preserves original text formatting and context
         """
-        desc_data = {}
-        
-        # Common selectors for product descriptions
-        description_selectors = [
-            '.product-description',
-            '.strain-description',
-            '.description',
-            '.product-details',
-            '.strain-info',
-            '.product-content',
-            '[class*=\"description\"]',
-            '[class*=\"details\"]'
-        ]
-        
-        all_descriptions = []
-        
-        for selector in description_selectors:
-            elements = soup.select(selector)
-            for element in elements:
-                text = element.get_text(separator=' ', strip=True)
-                if text and len(text) > 20:  # Filter out very short text
-                    all_descriptions.append(text)
-        
-        if all_descriptions:
-            # Combine all descriptions while preserving original text
-            full_description = ' '.join(all_descriptions)
-            desc_data['description_raw'] = full_description
-            desc_data['description_source'] = 'Product descriptions'
-            
-            # Extract specific mentions while preserving context
-            desc_data.update(self._extract_contextual_mentions(full_description))
+        # One selector pass; lexbor repeats a node once per selector it matches
+        elements = {}
+        for element in tree.css(_DESC_SELECTOR):
+            elements.setdefault(element.mem_id, element)
         
-        return desc_data
+        # Keep the selector priority order (document order within a selector)
+        texts = (
+            element.text(separator=' ', strip=True, skip_empty=True)
+            for element in sorted(elements.values(), key=self._description_rank)
+        )
+        
+        # Combine all descriptions while preserving original text
+        full_description = ' '.join(text for text in texts if len(text) > 20)  # Filter out very short text
+        
+        if not full_description:
+            return False
+        
+        out['description_raw'] = full_description
+        out['description_source'] = 'Product descriptions'
+        
+        # Extract specific mentions while preserving context
+        out.update(self._extract_contextual_mentions(full_description))
+        
+        return True
+    
+    def _description_rank(self, element: LexborNode) -> int:
+        """Index of the first description selector a node matches"""
+        return next(idx for idx, selector in enumerate(_DESC_SELECTORS) if element.css_matches(selector))
     
-    def _extract_with_patterns(self, soup: BeautifulSoup) -> Dict:
+    def _extract_with_patterns(self, tree: LexborHTMLParser, page_text: str, out: Dict,
+                               field_names: Tuple[str, ...] = _TARGET_FIELDS) -> bool:
         """
         Use regex patterns to find specific data points
         Extracts verbatim matches with surrounding context
         """
-        pattern_data = {}\n        page_text = soup.get_text(separator=' ', strip=True)\n        \n        # Define extraction patterns with context preservation\n        patterns = {\n            'thc_content': [\n                r'THC:?\\s*([^\\n\\.]+?)(?:\\.|\\n|$)',\n                r'(?:THC|thc)\\s*(?:content|level|percentage)?:?\\s*([^\\n\\.]+?)(?:\\.|\\n|$)',\n                r'([0-9]+(?:\\.[0-9]+)?(?:\\s*-\\s*[0-9]+(?:\\.[0-9]+)?)?\\s*%\\s*THC)'\n            ],\n            'cbd_content': [\n                r'CBD:?\\s*([^\\n\\.]+?)(?:\\.|\\n|$)',\n                r'(?:CBD|cbd)\\s*(?:content|level|percentage)?:?\\s*([^\\n\\.]+?)(?:\\.|\\n|$)',\n                r'([0-9]+(?:\\.[0-9]+)?(?:\\s*-\\s*[0-9]+(?:\\.[0-9]+)?)?\\s*%\\s*CBD)'\n            ],\n            'flowering_time': [\n                r'(?:flowering|flower)\\s+(?:time|period):?\\s*([^\\n\\.]+?)(?:\\.|\\n|$)',\n                r'(?:blooms?|flowers?)\\s+(?:in|for|after)\\s*([^\\n\\.]+?)(?:\\.|\\n|$)',\n                r'([0-9]+(?:\\s*-\\s*[0-9]+)?\\s*(?:weeks?|days?|wks?)\\s*(?:flowering|flower|bloom))'\n            ],\n            'height': [\n                r'(?:height|tall|grows?):?\\s*([^\\n\\.]+?)(?:\\.|\\n|$)',\n                r'(?:reaches|up to|grows to)\\s*([^\\n\\.]+?)(?:\\.|\\n|$)',\n                r'([0-9]+(?:\\s*-\\s*[0-9]+)?\\s*(?:cm|feet?|ft|inches?|in)\\s*(?:tall|high|height))'\n            ],\n            'yield': [\n                r'(?:yield|harvest|produces?):?\\s*([^\\n\\.]+?)(?:\\.|\\n|$)',\n                r'(?:up to|around|approximately)\\s*([^\\n\\.]+?)(?:\\.|\\n|$)',\n                r'([0-9]+(?:\\s*-\\s*[0-9]+)?\\s*(?:g|grams?|oz|ounces?)\\s*(?:per|/|m2|plant))'\n            ],\n            'genetics': [\n                r'(?:genetics|lineage|cross|bred from):?\\s*([^\\n\\.]+?)(?:\\.|\\n|$)',\n                r'([0-9]+\\s*%\\s*(?:sativa|indica)(?:\\s*[^\\n\\.]*?)?)(?:\\.|\\n|$)',\n                r'(?:hybrid|cross)\\s+(?:of|between)\\s*([^\\n\\.]+?)(?:\\.|\\n|$)'\n            ]\n        }\n        \n        for field_name, field_patterns in patterns.items():\n            for pattern in field_patterns:\n                matches = re.finditer(pattern, page_text, re.IGNORECASE | re.MULTILINE)\n                for match in matches:\n                    if match.group(1).strip():\n                        # Store the verbatim match\n                        pattern_data[f\"{field_name}_raw\"] = match.group(1).strip()\n                        pattern_data[f\"{field_name}_source\"] = \"Pattern matching\"\n                        break  # Take first match for each field\n            \n            if f\"{field_name}_raw\" in pattern_data:\n                continue  # Move to next field if we found a match\n        \n        return pattern_data\n    \n    def _extract_from_images(self, soup: BeautifulSoup) -> Dict:\n        \"\"\"\n        Extract data from images, icons, and visual elements\n        Describes visual elements as text for Bronze layer\n        \"\"\"\n        image_data = {}\n        \n        # Look for rating icons/stars\n        rating_elements = soup.find_all(['img', 'span', 'div'], \n                                       class_=re.compile(r'(star|rating|score)', re.I))\n        \n        for element in rating_elements:\n            # Describe visual ratings\n            if element.name == 'img':\n                alt_text = element.get('alt', '')\n                src = element.get('src', '')\n                if 'star' in alt_text.lower() or 'rating' in alt_text.lower():\n                    image_data['rating_visual_raw'] = f\"[Image: {alt_text}]\"\n                    image_data['rating_visual_source'] = \"Image alt text\"\n            else:\n                # Count visual elements like star spans\n                stars = element.find_all(class_=re.compile(r'star', re.I))\n                if stars:\n                    image_data['rating_visual_raw'] = f\"[Visual: {len(stars)} star elements]\"\n                    image_data['rating_visual_source'] = \"Visual elements\"\n        \n        # Look for difficulty/complexity indicators\n        difficulty_elements = soup.find_all(class_=re.compile(r'(difficulty|easy|hard|beginner)', re.I))\n        for element in difficulty_elements:\n            text = element.get_text(strip=True)\n            if text:\n                image_data['difficulty_raw'] = text\n                image_data['difficulty_source'] = \"Visual indicator\"\n                break\n        \n        return image_data\n    \n    def _extract_metadata(self, soup: BeautifulSoup) -> Dict:\n        \"\"\"\n        Extract metadata from HTML head and structured data\n        \"\"\"\n        meta_data = {}\n        \n        # Extract from meta tags\n        meta_description = soup.find('meta', attrs={'name': 'description'})\n        if meta_description:\n            content = meta_description.get('content', '')\n            if content:\n                meta_data['meta_description_raw'] = content\n                meta_data['meta_description_source'] = \"HTML meta tag\"\n        \n        # Extract from title tag\n        title_tag = soup.find('title')\n        if title_tag:\n            title_text = title_tag.get_text(strip=True)\n            if title_text:\n                meta_data['page_title_raw'] = title_text\n                meta_data['page_title_source'] = \"HTML title tag\"\n        \n        # Look for JSON-LD structured data\n        json_ld_scripts = soup.find_all('script', type='application/ld+json')\n        for script in json_ld_scripts:\n            try:\n                import json\n                structured_data = json.loads(script.string)\n                if isinstance(structured_data, dict):\n                    # Extract relevant product information\n                    if 'name' in structured_data:\n                        meta_data['structured_name_raw'] = structured_data['name']\n                        meta_data['structured_name_source'] = \"JSON-LD structured data\"\n                    if 'description' in structured_data:\n                        meta_data['structured_description_raw'] = structured_data['description']\n                        meta_data['structured_description_source'] = \"JSON-LD structured data\"\n            except (json.JSONDecodeError, AttributeError):\n                continue\n        \n        return meta_data\n    \n    def _is_specification_table(self, table) -> bool:\n        \"\"\"\n        Determine if a table contains strain specifications\n        \"\"\"\n        table_text = table.get_text().lower()\n        spec_keywords = ['thc', 'cbd', 'flowering', 'height', 'yield', 'genetics', 'sativa', 'indica']\n        \n        keyword_count = sum(1 for keyword in spec_keywords if keyword in table_text)\n        return keyword_count >= 2  # At least 2 cannabis-related keywords\n    \n    def _map_table_field(self, key_text: str) -> Optional[str]:\n        \"\"\"\n        Map table header text to standard field names\n        \"\"\"\n        key_lower = key_text.lower().strip()\n        \n        field_mappings = {\n            'thc': ['thc', 'thc content', 'thc level', 'thc %', 'thc percentage'],\n            'cbd': ['cbd', 'cbd content', 'cbd level', 'cbd %', 'cbd percentage'],\n            'flowering_time': ['flowering time', 'flowering period', 'flower time', 'bloom time', 'flowering'],\n            'height': ['height', 'plant height', 'size', 'grows to', 'tall'],\n            'yield': ['yield', 'harvest', 'production', 'output'],\n            'genetics': ['genetics', 'genetic background', 'lineage', 'breeding', 'cross'],\n            'effects': ['effects', 'effect', 'high', 'buzz'],\n            'flavors': ['flavor', 'flavour', 'taste', 'aroma', 'smell']\n        }\n        \n        for field_name, keywords in field_mappings.items():\n            if any(keyword in key_lower for keyword in keywords):\n                return field_name\n        \n        return None\n    \n    def _extract_contextual_mentions(self, text: str) -> Dict:\n        \"\"\"\n        Extract mentions of strain characteristics with surrounding context\n        \"\"\"\n        contextual_data = {}\n        \n        # Extract sentences containing key terms\n        sentences = re.split(r'[.!?]+', text)\n        \n        for sentence in sentences:\n            sentence = sentence.strip()\n            if not sentence:\n                continue\n            \n            sentence_lower = sentence.lower()\n            \n            # Look for effect mentions\n            effect_keywords = ['relaxing', 'euphoric', 'uplifting', 'energetic', 'creative', 'focused', 'happy', 'sleepy']\n            if any(keyword in sentence_lower for keyword in effect_keywords):\n                if 'effects_context_raw' not in contextual_data:\n                    contextual_data['effects_context_raw'] = sentence\n                    contextual_data['effects_context_source'] = \"Description context\"\n            \n            # Look for flavor mentions\n            flavor_keywords = ['citrus', 'lemon', 'berry', 'sweet', 'earthy', 'pine', 'diesel', 'fruity']\n            if any(keyword in sentence_lower for keyword in flavor_keywords):\n                if 'flavors_context_raw' not in contextual_data:\n                    contextual_data['flavors_context_raw'] = sentence\n                    contextual_data['flavors_context_source'] = \"Description context\"\n            \n            # Look for growing information\n            growing_keywords = ['indoor', 'outdoor', 'hydro', 'soil', 'climate', 'temperature']\n            if any(keyword in sentence_lower for keyword in growing_keywords):\n                if 'growing_context_raw' not in contextual_data:\n                    contextual_data['growing_context_raw'] = sentence\n                    contextual_data['growing_context_source'] = \"Description context\"\n        \n        return contextual_data\n    \n    def _get_timestamp(self) -> str:\n        \"\"\"\n        Get current timestamp for extraction tracking\n        \"\"\"\n        from datetime import datetime\n        return datetime.utcnow().isoformat() + 'Z'\n    \n    def get_extraction_stats(self) -> Dict:\n        \"\"\"\n        Return statistics about the extraction process\n        \"\"\"\n        return self.extraction_stats.copy()\n\ndef main():\n    \"\"\"Example usage of the Cannabis Data Extractor\"\"\"\n    \n    extractor = CannabisDataExtractor()\n    \n    # Example HTML content (simplified)\n    sample_html = \"\"\"\n    <html>\n    <head>\n        <title>Blue Dream Cannabis Seeds - Premium Genetics</title>\n        <meta name=\"description\" content=\"Blue Dream is a sativa-dominant hybrid with 18-24% THC\">\n    </head>\n    <body>\n        <div class=\"product-description\">\n            <p>Blue Dream is a legendary sativa-dominant hybrid with uplifting and euphoric effects. \n               This strain produces citrus and berry flavors with sweet undertones.</p>\n        </div>\n        <table class=\"specifications\">\n            <tr><th>THC Content</th><td>18-24%</td></tr>\n            <tr><th>CBD Content</th><td>0.1-0.2%</td></tr>\n            <tr><th>Flowering Time</th><td>9-10 weeks</td></tr>\n            <tr><th>Height</th><td>120-180cm</td></tr>\n        </table>\n    </body>\n    </html>\n    \"\"\"\n    \n    # Extract data\n    extracted_data = extractor.extract_strain_data(sample_html, \"https://example.com/blue-dream\")\n    \n    print(\"=== CANNABIS DATA EXTRACTOR EXAMPLE ===\")\n    print(f\"Source URL: {extracted_data['source_url']}\")\n    print(f\"Extraction Time: {extracted_data['extraction_timestamp']}\")\n    print(\"\\nExtracted Raw Data:\")\n    \n    for key, value in extracted_data['raw_data'].items():\n        print(f\"  {key}: {value}\")\n    \n    # Print extraction statistics\n    stats = extractor.get_extraction_stats()\n    print(f\"\\nExtraction Statistics:\")\n    for stat_name, count in stats.items():\n        print(f\"  {stat_name}: {count}\")\n\nif __name__ == \"__main__\":\n    main()
\ No newline at end of file
+        found = False
+        remaining = field_names
+        position = 0
+        
+        while remaining:
+            fused = _fused_pattern(remaining)
+            match = fused.search(page_text, position)
+            if not match:
+                break  # No more matches for any remaining field
+            
+            group_name = match.lastgroup
+            value = match.group(fused.groupindex[group_name] + 1).strip()
+            if not value:
+                position = match.start() + 1
+                continue
+            
+            # Store the verbatim match - first match wins for each field
+            field_name = group_name.split('__')[0]
+            out[f"{field_name}_raw"] = value
+            out[f"{field_name}_source"] = "Pattern matching"
+            found = True
+            
+            # Rescan from the match start (not its end) so text this match
+            # consumed is still searched for the fields that remain
+            remaining = tuple(name for name in remaining if name != field_name)
+            position = match.start()
+        
+        return found
+    
+    def _extract_from_images(self, tree: LexborHTMLParser, out: Dict) -> bool:
+        """
+        Extract data from images, icons, and visual elements
+        Describes visual elements as text for Bronze layer
+        """
+        found = False
+        
+        # Look for rating icons/stars
+        rating_elements = tree.css(_RATING_SELECTOR)
+        
+        for element in rating_elements:
+            # Describe visual ratings
+            if element.tag == 'img':
+                alt_text = element.attributes.get('alt') or ''
+                src = element.attributes.get('src') or ''
+                if 'star' in alt_text.lower() or 'rating' in alt_text.lower():
+                    out['rating_visual_raw'] = f"[Image: {alt_text}]"
+                    out['rating_visual_source'] = "Image alt text"
+                    found = True
+            else:
+                # Count visual elements like star spans (css() also matches element itself)
+                stars = [node for node in element.css(_STAR_SELECTOR) if node.mem_id != element.mem_id]
+                if stars:
+                    out['rating_visual_raw'] = f"[Visual: {len(stars)} star elements]"
+                    out['rating_visual_source'] = "Visual elements"
+                    found = True
+        
+        # Look for difficulty/complexity indicators
+        difficulty_elements = tree.css(_DIFFICULTY_SELECTOR)
+        for element in difficulty_elements:
+            text = element.text(strip=True)
+            if text:
+                out['difficulty_raw'] = text
+                out['difficulty_source'] = "Visual indicator"
+                found = True
+                break
+        
+        return found
+    
+    def _extract_metadata(self, tree: LexborHTMLParser, out: Dict) -> bool:
+        """
+        Extract metadata from HTML head and structured data
+        """
+        found = False
+        
+        # Extract from meta tags
+        meta_description = tree.css_first('meta[name="description"]')
+        if meta_description:
+            content = meta_description.attributes.get('content') or ''
+            if content:
+                out['meta_description_raw'] = content
+                out['meta_description_source'] = "HTML meta tag"
+                found = True
+        
+        # Extract from title tag
+        title_tag = tree.css_first('title')
+        if title_tag:
+            title_text = title_tag.text(strip=True)
+            if title_text:
+                out['page_title_raw'] = title_text
+                out['page_title_source'] = "HTML title tag"
+                found = True
+        
+        # Look for JSON-LD structured data
+        json_ld_scripts = tree.css('script[type="application/ld+json"]')
+        for script in json_ld_scripts:
+            script_text = script.text()
+            # Skip parsing payloads (often hundreds of KB) that can't hold either field
+            if '"name"' not in script_text and '"description"' not in script_text:
+                continue
+            try:
+                structured_data = orjson.loads(script_text)
+                if isinstance(structured_data, dict):
+                    # Extract relevant product information
+                    if 'name' in structured_data:
+                        out['structured_name_raw'] = structured_data['name']
+                        out['structured_name_source'] = "JSON-LD structured data"
+                        found = True
+                    if 'description' in structured_data:
+                        out['structured_description_raw'] = structured_data['description']
+                        out['structured_description_source'] = "JSON-LD structured data"
+                        found = True
+            except (orjson.JSONDecodeError, AttributeError):
+                continue
+        
+        return found
+    
+    def _is_specification_table(self, table: LexborNode) -> bool:
+        """
+        Determine if a table contains strain specifications
+        """
+        keywords_found = set()
+        for match in _SPEC_KEYWORD_RE.finditer(table.text()):
+            keywords_found.add(match.group().lower())
+            if len(keywords_found) >= 2:  # At least 2 cannabis-related keywords
+                return True
+        return False
+    
+    def _page_text(self, tree: LexborHTMLParser) -> str:
+        """
+        Get the visible page text, skipping script/style contents
+        """
+        text_tree = tree.clone()
+        text_tree.strip_tags(['script', 'style', 'template'])
+        return text_tree.root.text(separator=' ', strip=True, skip_empty=True)
+    
+    def _map_table_field(self, key_text: str) -> Optional[str]:
+        """
+        Map table header text to standard field names
+        """
+        key_lower = key_text.lower().strip()
+        
+        # Most headers are one of the known keywords verbatim
+        field_name = _KEY_TO_FIELD.get(key_lower)
+        if field_name:
+            return field_name
+        
+        return _scan_field_keywords(key_lower)
+    
+    def _extract_contextual_mentions(self, text: str) -> Dict:
+        """
+        Extract mentions of strain characteristics with surrounding context
+        """
+        contextual_data = {}
+        
+        # Find every keyword in one pass, then bisect the sentence delimiters
+        # to tell which sentence each hit landed in
+        text_lower = text.lower()
+        sentences = _SENTENCE_SPLIT_RE.split(text)
+        delimiter_ends = [match.end() for match in _SENTENCE_SPLIT_RE.finditer(text_lower)]
+        
+        first_sentence = {}
+        for end_idx, category in _CONTEXT_AUTOMATON.iter(text_lower):
+            if category not in first_sentence:
+                first_sentence[category] = bisect.bisect_right(delimiter_ends, end_idx)
+                if len(first_sentence) == len(_CONTEXT_KEYWORDS):
+                    break
+        
+        # Keep the first sentence mentioning each category, in sentence order
+        for category, sentence_idx in sorted(first_sentence.items(), key=lambda item: (item[1], _CONTEXT_ORDER[item[0]])):
+            contextual_data[f'{category}_context_raw'] = sentences[sentence_idx].strip()
+            contextual_data[f'{category}_context_source'] = "Description context"
+        
+        return contextual_data
+    
+    def _get_timestamp(self) -> str:
+        """
+        Get current timestamp for extraction tracking
+        """
+        return datetime.utcnow().isoformat() + 'Z'
+    
+    def get_extraction_stats(self) -> Dict:
+        """
+        Return statistics about the extraction process
+        """
+        return self.extraction_stats.copy()
+
+def _extract_one(page: Tuple[str, str]) -> Tuple[Dict, Dict]:
+    """Process-pool entry point: extract one page with a fresh extractor"""
+    html_content, source_url = page
+    extractor = CannabisDataExtractor()
+    extracted_data = extractor.extract_strain_data(html_content, source_url)
+    return extracted_data, extractor.get_extraction_stats()
+
+def main():
+    """Example usage of the Cannabis Data Extractor"""
+    
+    extractor = CannabisDataExtractor()
+    
+    # Example HTML content (simplified)
+    sample_html = """
+    <html>
+    <head>
+        <title>Blue Dream Cannabis Seeds - Premium Genetics</title>
+        <meta name="description" content="Blue Dream is a sativa-dominant hybrid with 18-24% THC">
+    </head>
+    <body>
+        <div class="product-description">
+            <p>Blue Dream is a legendary sativa-dominant hybrid with uplifting and euphoric effects. 
+               This strain produces citrus and berry flavors with sweet undertones.</p>
+        </div>
+        <table class="specifications">
+            <tr><th>THC Content</th><td>18-24%</td></tr>
+            <tr><th>CBD Content</th><td>0.1-0.2%</td></tr>
+            <tr><th>Flowering Time</th><td>9-10 weeks</td></tr>
+            <tr><th>Height</th><td>120-180cm</td></tr>
+        </table>
+    </body>
+    </html>
+    """
+    
+    # Extract data
+    extracted_data = extractor.extract_strain_data(sample_html, "https://example.com/blue-dream")
+    
+    print("=== CANNABIS DATA EXTRACTOR EXAMPLE ===")
+    print(f"Source URL: {extracted_data['source_url']}")
+    print(f"Extraction Time: {extracted_data['extraction_timestamp']}")
+    print("\nExtracted Raw Data:")
+    
+    for key, value in extracted_data['raw_data'].items():
+        print(f"  {key}: {value}")
+    
+    # Print extraction statistics
+    stats = extractor.get_extraction_stats()
+    print(f"\nExtraction Statistics:")
+    for stat_name, count in stats.items():
+        print(f"  {stat_name}: {count}")
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
@@ -4,13 +4,72 @@ Web Scraper - BrightData Integration for Cannabis Strain Data
 Part of the ingestion pipeline for the Cannabis Intelligence Index
 """
 
+import asyncio
+from concurrent.futures import ProcessPoolExecutor
+import httpx
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import json
+import re
 import boto3
-from bs4 import BeautifulSoup
+from bs4 import BeautifulSoup, SoupStrainer
+import soupsieve
+import functools
 import time
 from typing import Dict, List, Optional
 
+# Category pages only need their links, so skip building the rest of the tree
+_LINK_STRAINER = SoupStrainer('a', href=True)
+
+# Strain page patterns, compiled once at import
+_THC_RE = re.compile(r'THC:?\s*(\d+(?:\.\d+)?(?:\s*-\s*\d+(?:\.\d+)?)?)\s*%', re.IGNORECASE)
+_CBD_RE = re.compile(r'CBD:?\s*(\d+(?:\.\d+)?(?:\s*-\s*\d+(?:\.\d+)?)?)\s*%', re.IGNORECASE)
+_FLOWERING_RE = re.compile(r'(?:flowering|flower)\s+(?:time|period):?\s*(\d+(?:\s*-\s*\d+)?\s*(?:weeks?|days?))', re.IGNORECASE)
+
+# Title and URL cleanup is plain suffix work, done with string methods
+_SEED_SUFFIX_WORDS = ('seed', 'feminized', 'auto')
+_URL_EXTENSIONS = ('.html', '.htm', '.php')
+
+def _strip_seed_suffix(name: str) -> str:
+    """Cut a name at the first whitespace-led 'seed', 'feminized' or 'auto' (any case)"""
+    for cut in range(1, len(name)):
+        if name[cut - 1].isspace() and any(name[cut:cut + len(word)].lower() == word for word in _SEED_SUFFIX_WORDS):
+            return name[:cut].rstrip()
+    return name
+
+BRIGHTDATA_API_URL = "https://api.brightdata.com/request"
+
+# Common description selectors, most specific first
+_DESC_SELECTORS = [
+    '.product-description',
+    '.strain-description',
+    '.description',
+    '.product-details',
+    '.strain-info'
+]
+_DESC_SELECTOR = ', '.join(_DESC_SELECTORS)
+_DESC_MATCHERS = [soupsieve.compile(selector) for selector in _DESC_SELECTORS]
+
+# BrightData credentials are shared by every scraper in the process and refreshed hourly
+_CREDENTIALS_TTL_SECONDS = 3600
+_creds_fetched_at: Optional[float] = None
+
+@functools.lru_cache(maxsize=1)
+def _load_brightdata_credentials() -> Dict:
+    """Fetch BrightData credentials from AWS Secrets Manager (failures are not cached)"""
+    global _creds_fetched_at
+    secrets_client = boto3.client('secretsmanager', region_name='us-east-1')
+    response = secrets_client.get_secret_value(
+        SecretId='cannabis-brightdata-api'
+    )
+    _creds_fetched_at = time.monotonic()
+    return json.loads(response['SecretString'])
+
+def _parse_strain_page(html_content: str, strain_url: str) -> Dict:
+    """Process-pool entry point; parsing is a classmethod, so no scraper is built per call"""
+    return CannabisWebScraper.parse_strain_page(html_content, strain_url)
+
 class CannabisWebScraper:
     """
     Web scraper using BrightData for reliable cannabis strain data extraction
@@ -18,18 +77,36 @@ class CannabisWebScraper:
     """
     
     def __init__(self):
-        self.secrets_client = boto3.client('secretsmanager', region_name='us-east-1')
         self.brightdata_config = self._get_brightdata_credentials()
+        self.session = self._build_session()
         self.success_count = 0
         self.error_count = 0
     
+    def _build_session(self) -> requests.Session:
+        """Keep-alive session so every BrightData call reuses pooled TLS connections"""
+        session = requests.Session()
+        retry = Retry(
+            total=3,
+            backoff_factor=0.3,
+            status_forcelist=[429, 502, 503, 504],
+            allowed_methods=frozenset(['POST']),  # Unlocker requests are safe to repeat
+            raise_on_status=False
+        )
+        adapter = HTTPAdapter(pool_connections=32, pool_maxsize=32, max_retries=retry)
+        session.mount('https://', adapter)
+        
+        if self.brightdata_config:
+            session.headers['Authorization'] = f"Bearer {self.brightdata_config['api_key']}"
+        
+        return session
+    
     def _get_brightdata_credentials(self) -> Dict:
-        """Retrieve BrightData credentials from AWS Secrets Manager"""
+        """Retrieve BrightData credentials, reusing the process-wide copy until it expires"""
+        if _creds_fetched_at is not None and time.monotonic() - _creds_fetched_at > _CREDENTIALS_TTL_SECONDS:
+            _load_brightdata_credentials.cache_clear()
+        
         try:
-            response = self.secrets_client.get_secret_value(
-                SecretId='cannabis-brightdata-api'
-            )
-            return json.loads(response['SecretString'])
+            return dict(_load_brightdata_credentials())
         except Exception as e:
             print(f"ERROR: Failed to get BrightData credentials: {e}")
             return {}
@@ -41,19 +118,9 @@ class CannabisWebScraper:
         """
         if not self.brightdata_config:
             return None
-            
-        api_url = "https://api.brightdata.com/request"
-        headers = {
-            "Authorization": f"Bearer {self.brightdata_config['api_key']}"
-        }
-        payload = {
-            "zone": self.brightdata_config['zone'],
-            "url": url,
-            "format": "raw"
-        }
         
         try:
-            response = requests.post(api_url, headers=headers, json=payload, timeout=30)
+            response = self.session.post(BRIGHTDATA_API_URL, json=self._brightdata_payload(url), timeout=30)
             if response.status_code == 200:
                 self.success_count += 1
                 return response.text
@@ -66,6 +133,33 @@ class CannabisWebScraper:
             print(f"Request failed for {url}: {e}")
             return None
     
+    async def fetch_with_brightdata_async(self, client: httpx.AsyncClient, url: str) -> Optional[str]:
+        """Async counterpart of fetch_with_brightdata, used by scrape_many"""
+        if not self.brightdata_config:
+            return None
+        
+        try:
+            response = await client.post(BRIGHTDATA_API_URL, json=self._brightdata_payload(url), timeout=30)
+            if response.status_code == 200:
+                self.success_count += 1
+                return response.text
+            else:
+                self.error_count += 1
+                print(f"BrightData error {response.status_code} for {url}")
+                return None
+        except Exception as e:
+            self.error_count += 1
+            print(f"Request failed for {url}: {e}")
+            return None
+    
+    def _brightdata_payload(self, url: str) -> Dict:
+        """Web Unlocker request body for a target URL"""
+        return {
+            "zone": self.brightdata_config['zone'],
+            "url": url,
+            "format": "raw"
+        }
+    
     def extract_strain_urls(self, seed_bank_url: str, url_patterns: List[str]) -> List[str]:
         """
         Extract individual strain URLs from seed bank category pages
@@ -77,12 +171,18 @@ class CannabisWebScraper:
         Returns:
             List of unique strain URLs
         """
+        if not url_patterns:
+            return []
+        
         html_content = self.fetch_with_brightdata(seed_bank_url)
         if not html_content:
             return []
         
-        soup = BeautifulSoup(html_content, 'html.parser')
+        # One scan per link instead of one per pattern
+        pattern_re = re.compile('|'.join(map(re.escape, url_patterns)))
+        soup = BeautifulSoup(html_content, 'lxml', parse_only=_LINK_STRAINER)
         strain_urls = []
+        seen = set()
         
         # Extract all links
         for link in soup.find_all('a', href=True):
@@ -96,13 +196,12 @@ class CannabisWebScraper:
                 else:
                     continue
                 
-                # Check if URL matches strain patterns
-                for pattern in url_patterns:
-                    if pattern in href.lower():
-                        strain_urls.append(full_url)
-                        break
+                # Check if URL matches strain patterns, skipping duplicates
+                if full_url not in seen and pattern_re.search(href.lower()):
+                    seen.add(full_url)
+                    strain_urls.append(full_url)
         
-        return list(set(strain_urls))  # Remove duplicates
+        return strain_urls
     
     def scrape_strain_data(self, strain_url: str) -> Dict:
         """
@@ -113,7 +212,50 @@ class CannabisWebScraper:
         if not html_content:
             return {}
         
-        soup = BeautifulSoup(html_content, 'html.parser')
+        return self.parse_strain_page(html_content, strain_url)
+    
+    async def scrape_many(self, strain_urls: List[str], concurrency: int = 32) -> List[Dict]:
+        """
+        Scrape many strain pages concurrently
+        Fetches overlap on one HTTP/2 client; parsing runs in worker processes
+        
+        Returns:
+            Strain data dicts in the same order as strain_urls ({} for failed fetches)
+        """
+        if not self.brightdata_config:
+            return [{} for _ in strain_urls]
+        
+        semaphore = asyncio.Semaphore(concurrency)
+        transport = httpx.AsyncHTTPTransport(
+            http2=True,
+            limits=httpx.Limits(max_connections=64),
+            retries=3  # Connection failures only; HTTP errors are counted like the sync path
+        )
+        headers = {'Authorization': f"Bearer {self.brightdata_config['api_key']}"}
+        
+        async with httpx.AsyncClient(transport=transport, headers=headers) as client:
+            with ProcessPoolExecutor() as pool:
+                return await asyncio.gather(*(
+                    self._scrape_one(client, pool, semaphore, strain_url)
+                    for strain_url in strain_urls
+                ))
+    
+    async def _scrape_one(self, client: httpx.AsyncClient, pool: ProcessPoolExecutor,
+                          semaphore: asyncio.Semaphore, strain_url: str) -> Dict:
+        """Fetch one page under the concurrency limit, then parse it off the event loop"""
+        async with semaphore:
+            html_content = await self.fetch_with_brightdata_async(client, strain_url)
+        if not html_content:
+            return {}
+        
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(pool, _parse_strain_page, html_content, strain_url)
+    
+    @classmethod
+    def parse_strain_page(cls, html_content: str, strain_url: str) -> Dict:
+        """Run the 4-Method extraction over already-fetched strain page HTML"""
+        soup = BeautifulSoup(html_content, 'lxml')
+        page_text = soup.get_text()
         
         strain_data = {
             'source_url': strain_url,
@@ -121,32 +263,33 @@ class CannabisWebScraper:
         }
         
         # Method 1: Structured table extraction
-        table_data = self._extract_from_tables(soup)
+        table_data = cls._extract_from_tables(soup)
         if table_data:
             strain_data.update(table_data)
             strain_data['extraction_methods_used'].append('structured')
         
         # Method 2: Description mining
-        desc_data = self._extract_from_descriptions(soup)
+        desc_data = cls._extract_from_descriptions(soup)
         if desc_data:
             strain_data.update(desc_data)
             strain_data['extraction_methods_used'].append('description')
         
         # Method 3: Pattern matching
-        pattern_data = self._extract_with_patterns(soup, strain_url)
+        pattern_data = cls._extract_with_patterns(soup, page_text, strain_url)
         if pattern_data:
             strain_data.update(pattern_data)
             strain_data['extraction_methods_used'].append('patterns')
         
         # Method 4: Fallback extraction
-        fallback_data = self._fallback_extraction(soup, strain_url)
+        fallback_data = cls._fallback_extraction(soup, strain_url)
         if fallback_data:
             strain_data.update(fallback_data)
             strain_data['extraction_methods_used'].append('fallback')
         
         return strain_data
     
-    def _extract_from_tables(self, soup: BeautifulSoup) -> Dict:
+    @staticmethod
+    def _extract_from_tables(soup: BeautifulSoup) -> Dict:
         """Method 1: Extract data from structured tables"""
         data = {}
         
@@ -176,29 +319,19 @@ class CannabisWebScraper:
         
         return data
     
-    def _extract_from_descriptions(self, soup: BeautifulSoup) -> Dict:
+    @classmethod
+    def _extract_from_descriptions(cls, soup: BeautifulSoup) -> Dict:
         """Method 2: Mine product descriptions for strain data"""
         data = {}
         
-        # Common description selectors
-        desc_selectors = [
-            '.product-description',
-            '.strain-description', 
-            '.description',
-            '.product-details',
-            '.strain-info'
-        ]
-        
-        description_text = ""
-        for selector in desc_selectors:
-            elements = soup.select(selector)
-            for element in elements:
-                text = element.get_text().strip()
-                if len(text) > 50:
-                    description_text += " " + text
+        # One selector pass, then restore the selector priority order
+        elements = sorted(soup.select(_DESC_SELECTOR), key=cls._description_rank)
+        
+        texts = (element.get_text().strip() for element in elements)
+        description_text = ' '.join(text for text in texts if len(text) > 50)
         
         if description_text:
-            data['description_raw'] = description_text.strip()
+            data['description_raw'] = description_text
             
             # Extract effects and flavors from descriptions
             desc_lower = description_text.lower()
@@ -225,28 +358,28 @@ class CannabisWebScraper:
         
         return data
     
-    def _extract_with_patterns(self, soup: BeautifulSoup, url: str) -> Dict:
+    @staticmethod
+    def _description_rank(element) -> int:
+        """Index of the first description selector an element matches"""
+        return next(idx for idx, matcher in enumerate(_DESC_MATCHERS) if matcher.match(element))
+    
+    @staticmethod
+    def _extract_with_patterns(soup: BeautifulSoup, page_text: str, url: str) -> Dict:
         """Method 3: Use regex patterns to extract specific data"""
-        import re
-        
         data = {}
-        page_text = soup.get_text()
         
         # THC pattern
-        thc_pattern = r'THC:?\s*(\d+(?:\.\d+)?(?:\s*-\s*\d+(?:\.\d+)?)?)\s*%'
-        thc_match = re.search(thc_pattern, page_text, re.IGNORECASE)
+        thc_match = _THC_RE.search(page_text)
         if thc_match:
             data['thc_content_raw'] = thc_match.group(1) + '%'
         
         # CBD pattern
-        cbd_pattern = r'CBD:?\s*(\d+(?:\.\d+)?(?:\s*-\s*\d+(?:\.\d+)?)?)\s*%'
-        cbd_match = re.search(cbd_pattern, page_text, re.IGNORECASE)
+        cbd_match = _CBD_RE.search(page_text)
         if cbd_match:
             data['cbd_content_raw'] = cbd_match.group(1) + '%'
         
         # Flowering time pattern
-        flowering_pattern = r'(?:flowering|flower)\s+(?:time|period):?\s*(\d+(?:\s*-\s*\d+)?\s*(?:weeks?|days?))'
-        flowering_match = re.search(flowering_pattern, page_text, re.IGNORECASE)
+        flowering_match = _FLOWERING_RE.search(page_text)
         if flowering_match:
             data['flowering_time_raw'] = flowering_match.group(1)
         
@@ -255,13 +388,14 @@ class CannabisWebScraper:
         if title:
             title_text = title.get_text().strip()
             # Clean common suffixes
-            strain_name = re.sub(r'\s*-\s*.*$', '', title_text)  # Remove everything after dash
-            strain_name = re.sub(r'\s+(seeds?|feminized|auto).*$', '', strain_name, re.IGNORECASE)
+            strain_name = title_text.partition('-')[0]  # Remove everything after dash
+            strain_name = _strip_seed_suffix(strain_name)
             data['strain_name'] = strain_name.strip()
         
         return data
     
-    def _fallback_extraction(self, soup: BeautifulSoup, url: str) -> Dict:
+    @staticmethod
+    def _fallback_extraction(soup: BeautifulSoup, url: str) -> Dict:
         """Method 4: Fallback extraction for minimal data"""
         data = {}
         
@@ -272,7 +406,11 @@ class CannabisWebScraper:
                 if part and len(part) > 3:
                     strain_name = part.replace('-', ' ').replace('_', ' ').title()
                     # Remove common URL suffixes
-                    strain_name = re.sub(r'\.(html?|php)$', '', strain_name, re.IGNORECASE)
+                    strain_name_lower = strain_name.lower()
+                    for extension in _URL_EXTENSIONS:
+                        if strain_name_lower.endswith(extension):
+                            strain_name = strain_name[:-len(extension)]
+                            break
                     data['strain_name'] = strain_name
                     break
         
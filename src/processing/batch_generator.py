@@ -3,96 +3,216 @@
 Batch File Generator - Creates JSONL for Gemini Batch API
 """
 
+import asyncio
+import importlib.util
+import itertools
+import hishel
+from hishel.httpx import AsyncCacheClient
+import httpx
+import orjson
 import pandas as pd
-import json
-import requests
+from requests.adapters import HTTPAdapter
+from requests_cache import CachedSession
+from urllib3.util.retry import Retry
 from html_sanitizer import sanitize_html
 from master_system_prompt import MASTER_SYSTEM_PROMPT
-import time
 import os
 
+FETCH_HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
+}
+
+# Strain pages rarely change between runs, so fetched HTML is cached on disk for a day
+HTTP_CACHE_PATH = 'http_cache.sqlite'
+ASYNC_HTTP_CACHE_PATH = 'http_cache_async.sqlite'
+HTTP_CACHE_TTL_SECONDS = 86400
+
+def _build_session():
+    """Cached keep-alive session so sequential fetches reuse pooled connections"""
+    session = CachedSession(HTTP_CACHE_PATH, expire_after=HTTP_CACHE_TTL_SECONDS, stale_if_error=True)
+    session.headers.update(FETCH_HEADERS)
+    retry = Retry(total=3, backoff_factor=0.3, status_forcelist=[429, 502, 503, 504], raise_on_status=False)
+    adapter = HTTPAdapter(pool_connections=32, pool_maxsize=32, max_retries=retry)
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+    return session
+
+_SESSION = _build_session()
+
+class _SuccessfulResponses(hishel.BaseFilter[hishel.Response]):
+    """Only keep 200 responses in the async cache"""
+    
+    def needs_body(self):
+        return False
+    
+    def apply(self, item, body):
+        return item.status_code == 200
+
+# The only strain columns the batch needs
+STRAIN_COLUMNS = ('strain_name_cleaned', 'source_url')
+
+# pyarrow's multithreaded CSV reader is much faster than pandas' C parser; it's optional
+CSV_ENGINE = 'pyarrow' if importlib.util.find_spec('pyarrow') else 'c'
+
+# Output buffer size; JSONL lines go to disk in large chunks
+WRITE_BUFFER_SIZE = 8 * 1024 * 1024
+
+# Print progress every this many rows instead of once per row
+PROGRESS_INTERVAL = 500
+
+# Concurrent HTML fetches; the semaphore is the rate limit
+FETCH_CONCURRENCY = 32
+
 def generate_batch_jsonl(csv_path, output_path, max_requests=None):
     """Generate JSONL file for Gemini Batch API processing"""
+    return asyncio.run(generate_batch_jsonl_async(csv_path, output_path, max_requests))
+
+async def generate_batch_jsonl_async(csv_path, output_path, max_requests=None, concurrency=FETCH_CONCURRENCY):
+    """Generate JSONL file for Gemini Batch API processing, fetching HTML concurrently"""
     
     print("=== BATCH FILE GENERATOR ===")
     
     # Load strain data
-    df = pd.read_csv(csv_path)
+    df = load_strains(csv_path)
     print(f"Loaded {len(df)} strains")
     
     if max_requests:
         df = df.head(max_requests)
         print(f"Limited to {max_requests} requests for testing")
     
-    batch_requests = []
-    processed = 0
-    errors = 0
+    # Plain dicts for just the columns we read; avoids building a Series per row
+    columns = [column for column in STRAIN_COLUMNS if column in df]
+    records = df[columns].to_dict('records') if columns else [{} for _ in range(len(df))]
     
-    for idx, (_, strain) in enumerate(df.iterrows()):
-        try:
-            strain_name = strain.get('strain_name_cleaned', f'strain_{idx}')
-            source_url = strain.get('source_url', '')
-            
-            print(f"Processing {idx+1}/{len(df)}: {strain_name}")
-            
-            # Get HTML content
-            html_content = fetch_html(source_url)
-            if not html_content:
-                print(f"  Failed to fetch HTML for {strain_name}")
-                errors += 1
-                continue
-            
-            # Sanitize HTML
-            cleaned_html = sanitize_html(html_content)
-            
-            # Create batch request
-            request_data = {
-                "custom_id": f"strain_{idx}_{strain_name.replace(' ', '_')}",
-                "method": "POST",
-                "url": "/v1beta/models/gemini-2.5-flash:generateContent",
-                "body": {
-                    "contents": [{
-                        "parts": [{
-                            "text": f"{MASTER_SYSTEM_PROMPT}\n\nSTRAIN: {strain_name}\nURL: {source_url}\n\nHTML CONTENT:\n{cleaned_html}"
-                        }]
-                    }],
-                    "generationConfig": {
-                        "temperature": 0,
-                        "maxOutputTokens": 1000
-                    }
-                }
-            }
-            
-            batch_requests.append(request_data)
-            processed += 1
-            
-            # Rate limiting for HTML fetching
-            time.sleep(0.1)
-            
-        except Exception as e:
-            print(f"  Error processing {strain_name}: {e}")
-            errors += 1
+    semaphore = asyncio.Semaphore(concurrency)
+    completed = itertools.count(1)
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency, keepalive_expiry=30)
     
-    # Save JSONL file
-    with open(output_path, 'w') as f:
-        for request in batch_requests:
-            f.write(json.dumps(request) + '\n')
+    # Rows stream to a single writer task as they finish, so no request is
+    # held in memory after it's queued (lines land in completion order;
+    # custom_id carries the row index)
+    queue = asyncio.Queue()
+    with open(output_path, 'wb', buffering=WRITE_BUFFER_SIZE) as f:
+        writer = asyncio.create_task(write_jsonl(queue, f))
+        
+        # One pooled client for every fetch
+        async with new_async_client(limits) as client:
+            results = await asyncio.gather(*(
+                process_row(client, semaphore, queue, idx, strain, len(records), completed)
+                for idx, strain in enumerate(records)
+            ))
+        
+        await queue.put(None)
+        written = await writer
+    
+    processed = sum(results)
+    errors = len(results) - processed
     
     print(f"\n=== BATCH FILE COMPLETE ===")
-    print(f"Total requests: {len(batch_requests)}")
+    print(f"Total requests: {written}")
     print(f"Successfully processed: {processed}")
     print(f"Errors: {errors}")
     print(f"Output saved to: {output_path}")
     
     return output_path
 
+def load_strains(path):
+    """Load the strain table from CSV or Parquet, reading only STRAIN_COLUMNS"""
+    if path.endswith('.parquet'):
+        import pyarrow.parquet as pq
+        schema_columns = pq.read_schema(path).names
+        return pd.read_parquet(path, columns=[column for column in STRAIN_COLUMNS if column in schema_columns])
+    
+    # Peek at the header so a missing column is skipped rather than an error
+    header = pd.read_csv(path, nrows=0).columns
+    columns = [column for column in STRAIN_COLUMNS if column in header]
+    return pd.read_csv(path, engine=CSV_ENGINE, usecols=columns or None)
+
+def new_async_client(limits):
+    """Async HTTP client whose 200 responses are served from the on-disk cache until they expire"""
+    return AsyncCacheClient(
+        headers=FETCH_HEADERS,
+        limits=limits,
+        timeout=10,
+        follow_redirects=True,
+        storage=hishel.AsyncSqliteStorage(database_path=ASYNC_HTTP_CACHE_PATH, default_ttl=HTTP_CACHE_TTL_SECONDS),
+        policy=hishel.FilterPolicy(response_filters=[_SuccessfulResponses()])
+    )
+
+async def write_jsonl(queue, f):
+    """Write queued batch requests as JSONL lines until a None sentinel; returns the line count"""
+    written = 0
+    while True:
+        request_data = await queue.get()
+        if request_data is None:
+            return written
+        f.write(orjson.dumps(request_data))
+        f.write(b'\n')
+        written += 1
+
+async def process_row(client, semaphore, queue, idx, strain, total, completed):
+    """
+    Fetch, sanitize and queue one strain as a batch request; returns whether it succeeded
+    completed is the run's shared counter of finished fetches, used for progress lines
+    """
+    strain_name = strain.get('strain_name_cleaned', f'strain_{idx}')
+    try:
+        source_url = strain.get('source_url', '')
+        
+        # Get HTML content
+        async with semaphore:
+            html_content = await fetch_html_async(client, source_url)
+        
+        # Rows start together and finish in any order, so progress counts completed fetches
+        done = next(completed)
+        if done % PROGRESS_INTERVAL == 0 or done == total:
+            print(f"Processed {done}/{total}: {strain_name}")
+        if not html_content:
+            print(f"  Failed to fetch HTML for {strain_name}")
+            return False
+        
+        # Sanitize HTML
+        cleaned_html = sanitize_html(html_content)
+        
+        # Create batch request
+        request_data = {
+            "custom_id": f"strain_{idx}_{strain_name.replace(' ', '_')}",
+            "method": "POST",
+            "url": "/v1beta/models/gemini-2.5-flash:generateContent",
+            "body": {
+                "contents": [{
+                    "parts": [{
+                        "text": f"{MASTER_SYSTEM_PROMPT}\n\nSTRAIN: {strain_name}\nURL: {source_url}\n\nHTML CONTENT:\n{cleaned_html}"
+                    }]
+                }],
+                "generationConfig": {
+                    "temperature": 0,
+                    "maxOutputTokens": 1000
+                }
+            }
+        }
+        
+        await queue.put(request_data)
+        return True
+        
+    except Exception as e:
+        print(f"  Error processing {strain_name}: {e}")
+        return False
+
+async def fetch_html_async(client, url):
+    """Fetch HTML content from URL on a shared async client"""
+    try:
+        response = await client.get(url)
+        response.raise_for_status()
+        return response.text
+    except Exception as e:
+        print(f"    HTML fetch error: {e}")
+        return None
+
 def fetch_html(url):
     """Fetch HTML content from URL"""
     try:
-        headers = {
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
-        }
-        response = requests.get(url, headers=headers, timeout=10)
+        response = _SESSION.get(url, timeout=10)
         response.raise_for_status()
         return response.text
     except Exception as e:
@@ -3,53 +3,98 @@
 HTML Sanitizer - Strip non-essential HTML to save tokens
 """
 
-from bs4 import BeautifulSoup
+from selectolax.lexbor import LexborHTMLParser
 import re
 
+# Whitespace runs collapse to one space in the sanitized text
+_WS_RE = re.compile(r'\s+')
+
+# Sanitized text is cut to this many characters (plus "...")
+MAX_TEXT_LENGTH = 3000
+
+# Non-essential tags and ad/tracking containers dropped before text extraction
+_STRIP_TAGS = ['script', 'style', 'nav', 'header', 'footer', 'aside', 'meta', 'link']
+_AD_SELECTOR = '[class*=ad], [class*=banner], [class*=tracking], [class*=cookie], [class*=social]'
+
 def sanitize_html(html_content):
     """Clean HTML for token efficiency while preserving strain data"""
     
     # Parse HTML
-    soup = BeautifulSoup(html_content, 'html.parser')
+    tree = LexborHTMLParser(html_content)
     
-    # Remove non-essential elements
-    for element in soup(['script', 'style', 'nav', 'header', 'footer', 'aside', 'meta', 'link']):
-        element.decompose()
+    # Only the main content's text is kept, so clean just that subtree unless
+    # it sits inside something that gets removed (then fall back to the page)
+    main_content = tree.css_first('main')
+    if main_content is not None and not _is_removed(main_content):
+        _remove_non_content(main_content)
+    else:
+        _remove_non_content(tree)
+        main_content = tree.css_first('main') or tree.body or tree.root
     
-    # Remove ads and tracking
-    for element in soup.find_all(class_=re.compile(r'(ad|banner|tracking|cookie|social)')):
-        element.decompose()
+    # Clean text while preserving structure, reading only as much as the limit needs
+    cleaned_text = _bounded_text(main_content, MAX_TEXT_LENGTH) if main_content else ''
     
-    # Keep only strain-relevant content
-    strain_keywords = ['thc', 'cbd', 'flowering', 'height', 'yield', 'genetics', 'sativa', 'indica', 'effects', 'flavors']
-    
-    # Extract main content areas
-    main_content = soup.find('main') or soup.find('body') or soup
+    # Limit to 3000 characters for token efficiency
+    if len(cleaned_text) > MAX_TEXT_LENGTH:
+        cleaned_text = cleaned_text[:MAX_TEXT_LENGTH] + "..."
     
-    # Clean text while preserving structure
-    cleaned_text = main_content.get_text(separator=' ', strip=True)
+    return cleaned_text
+
+def _bounded_text(node, limit):
+    """Whitespace-collapsed text of node, like text(separator=' ', strip=True),
+    but stops walking text nodes once the result is known to exceed limit
+    """
+    parts = []
+    length = -1
+    for child in node.traverse(include_text=True):
+        if child.tag != '-text':
+            continue
+        # Unicode strip, so nodes holding only &nbsp; are dropped like the rest
+        text = child.text_content.strip()
+        if not text:
+            continue
+        parts.append(_WS_RE.sub(' ', text))
+        length += len(parts[-1]) + 1
+        if length > limit:
+            break
     
-    # Remove excessive whitespace
-    cleaned_text = re.sub(r'\s+', ' ', cleaned_text)
+    return ' '.join(parts)
+
+def _remove_non_content(root):
+    """Drop non-essential tags and ad/tracking elements under a tree or node"""
     
-    # Limit to 3000 characters for token efficiency
-    if len(cleaned_text) > 3000:
-        cleaned_text = cleaned_text[:3000] + "..."
+    # Remove non-essential elements
+    root.strip_tags(_STRIP_TAGS)
     
-    return cleaned_text
+    # Remove ads and tracking
+    # Lexbor lists a node once per selector it matches, and nested matches after
+    # their ancestors, so dedupe and remove innermost first
+    ad_elements = {}
+    for element in root.css(_AD_SELECTOR):
+        ad_elements.setdefault(element.mem_id, element)
+    for element in reversed(list(ad_elements.values())):
+        element.decompose()
+
+def _is_removed(node):
+    """Whether _remove_non_content on the whole page would drop this node"""
+    while node is not None and node.is_element_node:
+        if node.tag in _STRIP_TAGS or node.css_matches(_AD_SELECTOR):
+            return True
+        node = node.parent
+    return False
 
 def extract_tables(html_content):
     """Extract technical specification tables"""
-    soup = BeautifulSoup(html_content, 'html.parser')
+    tree = LexborHTMLParser(html_content)
     tables = []
     
-    for table in soup.find_all('table'):
+    for table in tree.css('table'):
         table_data = []
-        for row in table.find_all('tr'):
-            cells = [cell.get_text(strip=True) for cell in row.find_all(['td', 'th'])]
+        for row in table.css('tr'):
+            cells = [cell.text(strip=True) for cell in row.css('td, th')]
             if cells:
                 table_data.append(cells)
         if table_data:
             tables.append(table_data)
     
-    return tables
\ No newline at end of file
+    return tables
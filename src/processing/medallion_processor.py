@@ -4,9 +4,111 @@ Medallion Processor - Implements Bronze-to-Gold transformation
 Part of the Tri-Model AI Synthesis architecture
 """
 
+import ahocorasick
+import bisect
 import json
+import numpy as np
+import os
 import pandas as pd
-from typing import Dict, Any, Optional
+import re
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Any, Optional, Tuple
+
+try:
+    import hyperscan
+except ImportError:  # Hyperscan is optional; bulk extraction runs every row through re when it's missing
+    hyperscan = None
+
+# Bronze value patterns, compiled once at import
+_CM_RE = re.compile(r'(\d+(?:\.\d+)?)\s*-?\s*(\d+(?:\.\d+)?)?\s*cm', re.IGNORECASE)
+_FEET_RE = re.compile(r'(\d+(?:\.\d+)?)\s*-?\s*(\d+(?:\.\d+)?)?\s*(?:feet|ft)', re.IGNORECASE)
+_WEEK_RE = re.compile(r'(\d+)\s*-?\s*(\d+)?\s*(?:weeks?|wks?)', re.IGNORECASE)
+_DAY_RE = re.compile(r'(\d+)\s*-?\s*(\d+)?\s*days?', re.IGNORECASE)
+_PERCENT_RE = re.compile(r'(\d+(?:\.\d+)?)\s*-?\s*(\d+(?:\.\d+)?)?\s*%')
+_GENETICS_RES = {
+    genetics_type: re.compile(rf'(\d+)\s*%\s*{genetics_type}', re.IGNORECASE)
+    for genetics_type in ('sativa', 'indica')
+}
+
+def _build_prefilter(pattern: re.Pattern):
+    """Hyperscan database that reports where a bronze pattern can match (no capture groups)"""
+    database = hyperscan.Database()
+    database.compile(
+        expressions=[pattern.pattern.encode('ascii')],
+        ids=[0],
+        flags=[hyperscan.HS_FLAG_CASELESS if pattern.flags & re.IGNORECASE else 0]
+    )
+    return database
+
+# One SIMD scan per column finds the rows worth handing to re in process_bronze_df
+_PREFILTER_DATABASES = {} if hyperscan is None else {
+    pattern: _build_prefilter(pattern)
+    for pattern in (_CM_RE, _FEET_RE, _WEEK_RE, _DAY_RE, _PERCENT_RE, *_GENETICS_RES.values())
+}
+
+# Python's \s also covers these ASCII controls; scan them as plain spaces
+_PREFILTER_WHITESPACE = bytes.maketrans(b'\x0b\x0c\x1c\x1d\x1e\x1f', b'      ')
+
+# Common effect mappings
+_EFFECT_MAPPINGS = {
+    'relaxing': 'Relaxed',
+    'euphoric': 'Euphoric', 
+    'uplifting': 'Uplifted',
+    'energetic': 'Energetic',
+    'creative': 'Creative',
+    'focused': 'Focused',
+    'happy': 'Happy',
+    'sleepy': 'Sleepy'
+}
+
+# Common flavor mappings
+_FLAVOR_MAPPINGS = {
+    'citrus': 'Citrus',
+    'lemon': 'Lemon',
+    'orange': 'Orange',
+    'berry': 'Berry',
+    'sweet': 'Sweet',
+    'earthy': 'Earthy',
+    'pine': 'Pine',
+    'diesel': 'Diesel',
+    'skunk': 'Skunk',
+    'fruity': 'Fruity'
+}
+
+def _build_term_automaton(mappings: Dict[str, str]) -> ahocorasick.Automaton:
+    """Aho-Corasick automaton over a mapping's raw terms, valued (mapping order, standard term)"""
+    automaton = ahocorasick.Automaton()
+    for idx, (raw_term, standard_term) in enumerate(mappings.items()):
+        automaton.add_word(raw_term, (idx, standard_term))
+    automaton.make_automaton()
+    return automaton
+
+# All raw terms of a mapping are found in one scan of the lowered text
+_EFFECT_AUTOMATON = _build_term_automaton(_EFFECT_MAPPINGS)
+_FLAVOR_AUTOMATON = _build_term_automaton(_FLAVOR_MAPPINGS)
+
+# Confidence weights for different fields by importance
+_CONFIDENCE_WEIGHTS = {
+    'height_raw': 2,
+    'flowering_time_raw': 3,
+    'thc_content_raw': 3,
+    'cbd_content_raw': 2,
+    'genetics_raw': 2,
+    'effects_raw': 1,
+    'flavors_raw': 1
+}
+_CONFIDENCE_FIELDS = list(_CONFIDENCE_WEIGHTS)
+_CONFIDENCE_WEIGHT_VECTOR = np.array(list(_CONFIDENCE_WEIGHTS.values()))
+_CONFIDENCE_TOTAL = sum(_CONFIDENCE_WEIGHTS.values())
+
+# Completeness percentages at which the 1-5 confidence score steps up
+_CONFIDENCE_BINS = [30, 50, 70, 90]
+
+# Weights are small integers, so every possible weighted total maps to its score up front
+_CONFIDENCE_BY_TOTAL = np.array([
+    bisect.bisect_right(_CONFIDENCE_BINS, total / _CONFIDENCE_TOTAL * 100) + 1
+    for total in range(_CONFIDENCE_TOTAL + 1)
+])
 
 class MedallionProcessor:
     """
@@ -38,15 +140,21 @@ class MedallionProcessor:
             Dict containing both bronze and gold layers
         """
         
+        # Each raw field is scanned once for both ends of its range
+        height_min, height_max = self._extract_height_range_pair(bronze_data.get('height_raw'))
+        flowering_min, flowering_max = self._extract_flowering_range_pair(bronze_data.get('flowering_time_raw'))
+        thc_min, thc_max = self._extract_percentage_range_pair(bronze_data.get('thc_content_raw'))
+        cbd_min, cbd_max = self._extract_percentage_range_pair(bronze_data.get('cbd_content_raw'))
+        
         gold_data = {
-            'height_cm_min': self._extract_height_range(bronze_data.get('height_raw')),
-            'height_cm_max': self._extract_height_range(bronze_data.get('height_raw'), max_val=True),
-            'flowering_days_min': self._extract_flowering_range(bronze_data.get('flowering_time_raw')),
-            'flowering_days_max': self._extract_flowering_range(bronze_data.get('flowering_time_raw'), max_val=True),
-            'thc_percentage_min': self._extract_percentage_range(bronze_data.get('thc_content_raw')),
-            'thc_percentage_max': self._extract_percentage_range(bronze_data.get('thc_content_raw'), max_val=True),
-            'cbd_percentage_min': self._extract_percentage_range(bronze_data.get('cbd_content_raw')),
-            'cbd_percentage_max': self._extract_percentage_range(bronze_data.get('cbd_content_raw'), max_val=True),
+            'height_cm_min': height_min,
+            'height_cm_max': height_max,
+            'flowering_days_min': flowering_min,
+            'flowering_days_max': flowering_max,
+            'thc_percentage_min': thc_min,
+            'thc_percentage_max': thc_max,
+            'cbd_percentage_min': cbd_min,
+            'cbd_percentage_max': cbd_max,
             'sativa_percentage': self._extract_genetics(bronze_data.get('genetics_raw'), 'sativa'),
             'indica_percentage': self._extract_genetics(bronze_data.get('genetics_raw'), 'indica'),
             'effects_standardized': self._standardize_effects(bronze_data.get('effects_raw')),
@@ -59,103 +167,212 @@ class MedallionProcessor:
             'gold': gold_data
         }
     
-    def _extract_height_range(self, height_raw: Optional[str], max_val: bool = False) -> Optional[float]:
-        """Extract height in cm from raw text"""
-        if not height_raw:
+    def process_bronze_df(self, bronze_df: pd.DataFrame) -> pd.DataFrame:
+        """
+        Vectorized Bronze-to-Gold transformation for a whole DataFrame of bronze rows
+        
+        Args:
+            bronze_df: One row per strain, with the same *_raw columns process_bronze_to_gold reads
+            
+        Returns:
+            DataFrame of gold columns aligned to bronze_df's index
+            (missing, empty or non-text raw values count as absent and give NaN)
+        """
+        height_raw = self._text_column(bronze_df, 'height_raw')
+        flowering_raw = self._text_column(bronze_df, 'flowering_time_raw')
+        genetics_raw = self._text_column(bronze_df, 'genetics_raw')
+        
+        # Height: descriptive words win, then cm, then feet
+        height_rules = self.conversion_rules['height']
+        cm_min, cm_max = self._range_columns(height_raw, _CM_RE)
+        feet_min, feet_max = self._range_columns(height_raw, _FEET_RE, height_rules['feet_to_cm'])
+        height_lower = height_raw.str.lower()
+        descriptive_height = pd.Series(np.nan, index=bronze_df.index)
+        for label in ('Tall', 'Medium', 'Short'):  # Reverse priority so earlier labels overwrite later ones
+            is_label = height_lower.str.contains(label.lower(), regex=False, na=False)
+            descriptive_height = descriptive_height.mask(is_label, height_rules[label])
+        height_min = descriptive_height.fillna(cm_min.fillna(feet_min))
+        height_max = descriptive_height.fillna(cm_max.fillna(feet_max))
+        
+        # Flowering: weeks, then days
+        week_min, week_max = self._range_columns(flowering_raw, _WEEK_RE, self.conversion_rules['flowering']['weeks_to_days'])
+        day_min, day_max = self._range_columns(flowering_raw, _DAY_RE)
+        
+        thc_min, thc_max = self._range_columns(self._text_column(bronze_df, 'thc_content_raw'), _PERCENT_RE)
+        cbd_min, cbd_max = self._range_columns(self._text_column(bronze_df, 'cbd_content_raw'), _PERCENT_RE)
+        
+        return pd.DataFrame({
+            'height_cm_min': height_min,
+            'height_cm_max': height_max,
+            'flowering_days_min': week_min.fillna(day_min),
+            'flowering_days_max': week_max.fillna(day_max),
+            'thc_percentage_min': thc_min,
+            'thc_percentage_max': thc_max,
+            'cbd_percentage_min': cbd_min,
+            'cbd_percentage_max': cbd_max,
+            'sativa_percentage': self._extract_groups(genetics_raw, _GENETICS_RES['sativa'])[0].astype(float),
+            'indica_percentage': self._extract_groups(genetics_raw, _GENETICS_RES['indica'])[0].astype(float),
+            'effects_standardized': self._standardize_column(self._text_column(bronze_df, 'effects_raw'), _EFFECT_MAPPINGS),
+            'flavors_standardized': self._standardize_column(self._text_column(bronze_df, 'flavors_raw'), _FLAVOR_MAPPINGS),
+            'confidence_score': self._confidence_column(bronze_df)
+        }, index=bronze_df.index)
+    
+    def process_bronze_chunks(self, bronze_df: pd.DataFrame, workers: Optional[int] = None) -> pd.DataFrame:
+        """
+        process_bronze_df split across worker processes, one contiguous chunk each
+        Same result as process_bronze_df; worth it for large frames
+        """
+        workers = min(workers or os.cpu_count(), len(bronze_df))
+        if workers <= 1:
+            return self.process_bronze_df(bronze_df)
+        
+        bounds = np.linspace(0, len(bronze_df), workers + 1, dtype=int)
+        chunks = [bronze_df.iloc[start:end] for start, end in zip(bounds[:-1], bounds[1:])]
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            return pd.concat(executor.map(_process_bronze_chunk, chunks))
+    
+    def _text_column(self, bronze_df: pd.DataFrame, column: str) -> pd.Series:
+        """Bronze column as object dtype, with empty and non-text values masked to NaN"""
+        if column not in bronze_df:
+            return pd.Series(np.nan, index=bronze_df.index, dtype=object)
+        values = bronze_df[column].astype(object)
+        # Element-wise, since .str refuses a column read_csv inferred as numbers
+        return values.where(values.map(lambda value: isinstance(value, str) and value != ''))
+    
+    def _range_columns(self, raw: pd.Series, pattern: re.Pattern, scale: float = 1) -> Tuple[pd.Series, pd.Series]:
+        """(min, max) columns from a two-group range pattern; max falls back to min"""
+        groups = self._extract_groups(raw, pattern)
+        min_col = groups[0].astype(float) * scale
+        max_col = (groups[1].astype(float) * scale).fillna(min_col)
+        return min_col, max_col
+    
+    def _extract_groups(self, raw: pd.Series, pattern: re.Pattern) -> pd.DataFrame:
+        """Series.str.extract, skipping rows a Hyperscan prefilter rules out (when available)"""
+        candidates = self._candidate_rows(raw, pattern)
+        if candidates is not None:
+            raw = raw.where(candidates)
+        return raw.str.extract(pattern)
+    
+    def _candidate_rows(self, raw: pd.Series, pattern: re.Pattern) -> Optional[np.ndarray]:
+        """Boolean mask of rows where the pattern may match, from one scan of the whole column"""
+        database = _PREFILTER_DATABASES.get(pattern)
+        if database is None:
             return None
+        
+        # Hyperscan sees ASCII bytes; any other text goes straight to re
+        texts = raw.where(raw.notna(), '')
+        is_ascii = texts.map(str.isascii).to_numpy(dtype=bool)
+        candidates = ~is_ascii
+        ascii_texts = texts.where(is_ascii, '')
+        
+        # Rows are NUL-separated; no pattern can match across a NUL
+        row_ends = np.cumsum(ascii_texts.str.len().to_numpy(dtype=np.int64) + 1) - 1
+        buffer = '\x00'.join(ascii_texts).encode('ascii').translate(_PREFILTER_WHITESPACE)
+        
+        match_ends = []
+        database.scan(buffer, match_event_handler=lambda pattern_id, start, end, flags, context: match_ends.append(end))
+        candidates[np.searchsorted(row_ends, match_ends)] = True
+        return candidates
+    
+    def _standardize_column(self, raw: pd.Series, mappings: Dict[str, str]) -> pd.Series:
+        """Vectorized counterpart of _standardize_effects / _standardize_flavors"""
+        raw_lower = raw.str.lower()
+        joined = pd.Series('', index=raw.index, dtype=object)
+        for raw_term, standard_term in mappings.items():
+            has_term = raw_lower.str.contains(raw_term, regex=False, na=False)
+            joined = joined.mask(has_term, joined + standard_term + ', ')
+        return joined.str[:-2].where(joined != '')
+    
+    def _confidence_column(self, bronze_df: pd.DataFrame) -> pd.Series:
+        """Vectorized counterpart of _calculate_confidence"""
+        is_present = np.zeros((len(bronze_df), len(_CONFIDENCE_FIELDS)), dtype=bool)
+        for i, field in enumerate(_CONFIDENCE_FIELDS):
+            if field in bronze_df:
+                values = bronze_df[field]
+                is_present[:, i] = values.notna() & (values.astype(str).str.strip().str.len() > 2)
+        
+        # Convert to 1-5 scale
+        return pd.Series(_CONFIDENCE_BY_TOTAL[is_present @ _CONFIDENCE_WEIGHT_VECTOR], index=bronze_df.index)
+    
+    def _extract_height_range_pair(self, height_raw: Optional[str]) -> Tuple[Optional[float], Optional[float]]:
+        """Extract (min, max) height in cm from raw text"""
+        if not height_raw:
+            return None, None
             
         # Handle descriptive heights
         height_lower = height_raw.lower()
         if 'short' in height_lower:
-            return self.conversion_rules['height']['Short']
+            height = self.conversion_rules['height']['Short']
+            return height, height
         elif 'medium' in height_lower:
-            return self.conversion_rules['height']['Medium']
+            height = self.conversion_rules['height']['Medium']
+            return height, height
         elif 'tall' in height_lower:
-            return self.conversion_rules['height']['Tall']
+            height = self.conversion_rules['height']['Tall']
+            return height, height
         
         # Extract numeric ranges (e.g., "80-120cm", "3-4 feet")
-        import re
-        
         # Look for cm measurements
-        cm_pattern = r'(\d+(?:\.\d+)?)\s*-?\s*(\d+(?:\.\d+)?)?\s*cm'
-        cm_match = re.search(cm_pattern, height_raw, re.IGNORECASE)
+        cm_match = _CM_RE.search(height_raw)
         if cm_match:
             min_val = float(cm_match.group(1))
             max_val_found = cm_match.group(2)
-            if max_val_found and max_val:
-                return float(max_val_found)
-            return min_val
+            return min_val, float(max_val_found) if max_val_found else min_val
         
         # Look for feet measurements
-        feet_pattern = r'(\d+(?:\.\d+)?)\s*-?\s*(\d+(?:\.\d+)?)?\s*(?:feet|ft)'
-        feet_match = re.search(feet_pattern, height_raw, re.IGNORECASE)
+        feet_match = _FEET_RE.search(height_raw)
         if feet_match:
-            min_val = float(feet_match.group(1)) * self.conversion_rules['height']['feet_to_cm']
+            feet_to_cm = self.conversion_rules['height']['feet_to_cm']
+            min_val = float(feet_match.group(1)) * feet_to_cm
             max_val_found = feet_match.group(2)
-            if max_val_found and max_val:
-                return float(max_val_found) * self.conversion_rules['height']['feet_to_cm']
-            return min_val
+            return min_val, float(max_val_found) * feet_to_cm if max_val_found else min_val
         
-        return None
+        return None, None
     
-    def _extract_flowering_range(self, flowering_raw: Optional[str], max_val: bool = False) -> Optional[int]:
-        """Extract flowering time in days from raw text"""
+    def _extract_flowering_range_pair(self, flowering_raw: Optional[str]) -> Tuple[Optional[int], Optional[int]]:
+        """Extract (min, max) flowering time in days from raw text"""
         if not flowering_raw:
-            return None
-            
-        import re
+            return None, None
         
         # Look for week patterns (e.g., "8-9 weeks", "7 wks")
-        week_pattern = r'(\d+)\s*-?\s*(\d+)?\s*(?:weeks?|wks?)'
-        week_match = re.search(week_pattern, flowering_raw, re.IGNORECASE)
+        week_match = _WEEK_RE.search(flowering_raw)
         if week_match:
-            min_weeks = int(week_match.group(1))
+            weeks_to_days = self.conversion_rules['flowering']['weeks_to_days']
+            min_days = int(week_match.group(1)) * weeks_to_days
             max_weeks = week_match.group(2)
-            if max_weeks and max_val:
-                return int(max_weeks) * self.conversion_rules['flowering']['weeks_to_days']
-            return min_weeks * self.conversion_rules['flowering']['weeks_to_days']
+            return min_days, int(max_weeks) * weeks_to_days if max_weeks else min_days
         
         # Look for day patterns
-        day_pattern = r'(\d+)\s*-?\s*(\d+)?\s*days?'
-        day_match = re.search(day_pattern, flowering_raw, re.IGNORECASE)
+        day_match = _DAY_RE.search(flowering_raw)
         if day_match:
             min_days = int(day_match.group(1))
             max_days = day_match.group(2)
-            if max_days and max_val:
-                return int(max_days)
-            return min_days
+            return min_days, int(max_days) if max_days else min_days
         
-        return None
+        return None, None
     
-    def _extract_percentage_range(self, percentage_raw: Optional[str], max_val: bool = False) -> Optional[float]:
-        """Extract percentage values from raw text"""
+    def _extract_percentage_range_pair(self, percentage_raw: Optional[str]) -> Tuple[Optional[float], Optional[float]]:
+        """Extract (min, max) percentage values from raw text"""
         if not percentage_raw:
-            return None
-            
-        import re
+            return None, None
         
         # Look for percentage patterns (e.g., "15-20%", "18%", "up to 25%")
-        percent_pattern = r'(\d+(?:\.\d+)?)\s*-?\s*(\d+(?:\.\d+)?)?\s*%'
-        percent_match = re.search(percent_pattern, percentage_raw)
+        percent_match = _PERCENT_RE.search(percentage_raw)
         if percent_match:
             min_val = float(percent_match.group(1))
             max_val_found = percent_match.group(2)
-            if max_val_found and max_val:
-                return float(max_val_found)
-            return min_val
+            return min_val, float(max_val_found) if max_val_found else min_val
         
-        return None
+        return None, None
     
     def _extract_genetics(self, genetics_raw: Optional[str], genetics_type: str) -> Optional[int]:
         """Extract sativa/indica percentages from raw genetics text"""
         if not genetics_raw:
             return None
-            
-        import re
         
         # Look for percentage patterns (e.g., "60% Sativa", "40% Indica")
-        pattern = rf'(\d+)\s*%\s*{genetics_type}'
-        match = re.search(pattern, genetics_raw, re.IGNORECASE)
+        pattern = _GENETICS_RES.get(genetics_type) or re.compile(rf'(\d+)\s*%\s*{genetics_type}', re.IGNORECASE)
+        match = pattern.search(genetics_raw)
         if match:
             return int(match.group(1))
         
@@ -165,90 +382,36 @@ class MedallionProcessor:
         """Standardize effect descriptions"""
         if not effects_raw:
             return None
-            
-        # Common effect mappings
-        effect_mappings = {
-            'relaxing': 'Relaxed',
-            'euphoric': 'Euphoric', 
-            'uplifting': 'Uplifted',
-            'energetic': 'Energetic',
-            'creative': 'Creative',
-            'focused': 'Focused',
-            'happy': 'Happy',
-            'sleepy': 'Sleepy'
-        }
         
-        standardized_effects = []
-        effects_lower = effects_raw.lower()
-        
-        for raw_effect, standard_effect in effect_mappings.items():
-            if raw_effect in effects_lower:
-                standardized_effects.append(standard_effect)
-        
-        return ', '.join(standardized_effects) if standardized_effects else None
+        return self._standardize_terms(effects_raw, _EFFECT_AUTOMATON)
     
     def _standardize_flavors(self, flavors_raw: Optional[str]) -> Optional[str]:
         """Standardize flavor descriptions"""
         if not flavors_raw:
             return None
-            
-        # Common flavor mappings
-        flavor_mappings = {
-            'citrus': 'Citrus',
-            'lemon': 'Lemon',
-            'orange': 'Orange',
-            'berry': 'Berry',
-            'sweet': 'Sweet',
-            'earthy': 'Earthy',
-            'pine': 'Pine',
-            'diesel': 'Diesel',
-            'skunk': 'Skunk',
-            'fruity': 'Fruity'
-        }
         
-        standardized_flavors = []
-        flavors_lower = flavors_raw.lower()
-        
-        for raw_flavor, standard_flavor in flavor_mappings.items():
-            if raw_flavor in flavors_lower:
-                standardized_flavors.append(standard_flavor)
-        
-        return ', '.join(standardized_flavors) if standardized_flavors else None
+        return self._standardize_terms(flavors_raw, _FLAVOR_AUTOMATON)
+    
+    def _standardize_terms(self, text: str, automaton: ahocorasick.Automaton) -> Optional[str]:
+        """Standard terms whose raw term occurs in the text, in mapping order"""
+        found = {match for _, match in automaton.iter(text.lower())}
+        return ', '.join(standard_term for _, standard_term in sorted(found)) or None
     
     def _calculate_confidence(self, bronze_data: Dict[str, Any]) -> int:
         """Calculate confidence score (1-5) based on data completeness"""
         
-        # Weight different fields by importance
-        field_weights = {
-            'height_raw': 2,
-            'flowering_time_raw': 3,
-            'thc_content_raw': 3,
-            'cbd_content_raw': 2,
-            'genetics_raw': 2,
-            'effects_raw': 1,
-            'flavors_raw': 1
-        }
-        
-        total_possible = sum(field_weights.values())
         actual_score = 0
         
-        for field, weight in field_weights.items():
+        for field, weight in _CONFIDENCE_WEIGHTS.items():
             if bronze_data.get(field) and len(str(bronze_data[field]).strip()) > 2:
                 actual_score += weight
         
         # Convert to 1-5 scale
-        percentage = (actual_score / total_possible) * 100
-        
-        if percentage >= 90:
-            return 5
-        elif percentage >= 70:
-            return 4
-        elif percentage >= 50:
-            return 3
-        elif percentage >= 30:
-            return 2
-        else:
-            return 1
+        return int(_CONFIDENCE_BY_TOTAL[actual_score])
+
+def _process_bronze_chunk(bronze_df: pd.DataFrame) -> pd.DataFrame:
+    """Process-pool entry point: run one chunk through a fresh processor"""
+    return MedallionProcessor().process_bronze_df(bronze_df)
 
 def main():
     """Example usage of the Medallion Processor"""
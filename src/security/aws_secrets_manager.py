@@ -4,24 +4,30 @@ AWS Secrets Manager - Store Google Service Account Key
 """
 
 import boto3
-import json
+import functools
+import orjson
 from botocore.exceptions import ClientError
 
-def store_google_credentials(service_account_json_path, aws_access_key, aws_secret_key, region='us-east-1'):
-    """Store Google service account key in AWS Secrets Manager"""
-    
-    # Read the service account JSON file
-    with open(service_account_json_path, 'r') as f:
-        service_account_data = json.load(f)
-    
-    # Initialize AWS Secrets Manager client
+@functools.lru_cache(maxsize=4)
+def _secrets_client(aws_access_key, aws_secret_key, region):
+    """Secrets Manager client for one set of AWS keys, built once and reused"""
     session = boto3.Session(
         aws_access_key_id=aws_access_key,
         aws_secret_access_key=aws_secret_key,
         region_name=region
     )
+    return session.client('secretsmanager')
+
+def store_google_credentials(service_account_json_path, aws_access_key, aws_secret_key, region='us-east-1'):
+    """Store Google service account key in AWS Secrets Manager"""
     
-    secrets_client = session.client('secretsmanager')
+    # Read the service account JSON file
+    with open(service_account_json_path, 'rb') as f:
+        service_account_data = orjson.loads(f.read())
+    secret_string = orjson.dumps(service_account_data).decode()
+    
+    # Initialize AWS Secrets Manager client
+    secrets_client = _secrets_client(aws_access_key, aws_secret_key, region)
     
     secret_name = "cannabis-genetics-google-service-account"
     
@@ -30,7 +36,7 @@ def store_google_credentials(service_account_json_path, aws_access_key, aws_secr
         response = secrets_client.create_secret(
             Name=secret_name,
             Description="Google Cloud service account key for Cannabis Genetics Database",
-            SecretString=json.dumps(service_account_data)
+            SecretString=secret_string
         )
         
         print(f"✅ Secret created successfully!")
@@ -42,7 +48,7 @@ def store_google_credentials(service_account_json_path, aws_access_key, aws_secr
             # Update existing secret
             response = secrets_client.update_secret(
                 SecretId=secret_name,
-                SecretString=json.dumps(service_account_data)
+                SecretString=secret_string
             )
             print(f"✅ Secret updated successfully!")
             print(f"Secret ARN: {response['ARN']}")
@@ -55,18 +61,12 @@ def store_google_credentials(service_account_json_path, aws_access_key, aws_secr
 def retrieve_google_credentials(aws_access_key, aws_secret_key, region='us-east-1'):
     """Retrieve Google service account key from AWS Secrets Manager"""
     
-    session = boto3.Session(
-        aws_access_key_id=aws_access_key,
-        aws_secret_access_key=aws_secret_key,
-        region_name=region
-    )
-    
-    secrets_client = session.client('secretsmanager')
+    secrets_client = _secrets_client(aws_access_key, aws_secret_key, region)
     secret_name = "cannabis-genetics-google-service-account"
     
     try:
         response = secrets_client.get_secret_value(SecretId=secret_name)
-        secret_data = json.loads(response['SecretString'])
+        secret_data = orjson.loads(response['SecretString'])
         return secret_data
     except ClientError as e:
         print(f"❌ Error retrieving secret: {e}")
@@ -4,30 +4,44 @@ Secure Credential Manager - Uses AWS default credentials and stores Google servi
 """
 
 import boto3
-import json
+import functools
+import hashlib
+import orjson
 import os
+import pathlib
 from botocore.exceptions import ClientError
 
+SECRET_NAME = "cannabis-genetics-google-service-account"
+
+@functools.lru_cache(maxsize=4)
+def _secrets_client(region='us-east-1'):
+    """Secrets Manager client, built once per region and reused"""
+    return boto3.client('secretsmanager', region_name=region)
+
+@functools.lru_cache(maxsize=1)
+def _load_google_credentials():
+    """Fetch and parse the service account secret (errors propagate, so failures are not cached)"""
+    response = _secrets_client().get_secret_value(SecretId=SECRET_NAME)
+    return orjson.loads(response['SecretString'])
+
 def store_google_service_account():
     """Store Google service account key in AWS Secrets Manager"""
     
     # Read the service account JSON file
     service_account_path = "../cannabis-genetics-db-261c538aa94f.json"
     
-    with open(service_account_path, 'r') as f:
-        service_account_data = json.load(f)
+    service_account_data = orjson.loads(pathlib.Path(service_account_path).read_bytes())
+    secret_string = orjson.dumps(service_account_data).decode()
     
     # Use default AWS credentials from ~/.aws/credentials
-    secrets_client = boto3.client('secretsmanager', region_name='us-east-1')
-    
-    secret_name = "cannabis-genetics-google-service-account"
+    secrets_client = _secrets_client()
     
     try:
         # Create the secret
         response = secrets_client.create_secret(
-            Name=secret_name,
+            Name=SECRET_NAME,
             Description="Google Cloud service account key for Cannabis Genetics Database",
-            SecretString=json.dumps(service_account_data)
+            SecretString=secret_string
         )
         
         print(f"SUCCESS: Secret created successfully!")
@@ -35,10 +49,15 @@ def store_google_service_account():
         
     except ClientError as e:
         if e.response['Error']['Code'] == 'ResourceExistsException':
+            # Skip the write when the stored key is already identical
+            if _secret_digest(secrets_client) == _digest(secret_string):
+                print(f"SUCCESS: Secret already up to date, no update needed")
+                return True
+            
             # Update existing secret
             response = secrets_client.update_secret(
-                SecretId=secret_name,
-                SecretString=json.dumps(service_account_data)
+                SecretId=SECRET_NAME,
+                SecretString=secret_string
             )
             print(f"SUCCESS: Secret updated successfully!")
             print(f"Secret ARN: {response['ARN']}")
@@ -46,17 +65,27 @@ def store_google_service_account():
             print(f"ERROR: {e}")
             return False
     
+    # The stored secret changed, so drop any copy cached in this process
+    _load_google_credentials.cache_clear()
     return True
 
+def _digest(secret_string):
+    """SHA-256 of a secret string, for cheap equality checks"""
+    return hashlib.sha256(secret_string.encode()).hexdigest()
+
+def _secret_digest(secrets_client):
+    """Digest of the currently stored secret, or None if it can't be read"""
+    try:
+        response = secrets_client.get_secret_value(SecretId=SECRET_NAME)
+    except ClientError:
+        return None
+    return _digest(response.get('SecretString', ''))
+
 def get_google_credentials():
-    """Retrieve Google service account credentials from AWS Secrets Manager"""
-    
-    secrets_client = boto3.client('secretsmanager', region_name='us-east-1')
-    secret_name = "cannabis-genetics-google-service-account"
+    """Retrieve Google service account credentials from AWS Secrets Manager (cached per process)"""
     
     try:
-        response = secrets_client.get_secret_value(SecretId=secret_name)
-        return json.loads(response['SecretString'])
+        return dict(_load_google_credentials())
     except ClientError as e:
         print(f"ERROR: Error retrieving Google credentials: {e}")
         return None
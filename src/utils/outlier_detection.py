@@ -4,9 +4,105 @@ Outlier Detection - Quality validation for cannabis strain data
 Identifies impossible values and potential AI hallucinations
 """
 
+import hashlib
+import os
 import pandas as pd
 import numpy as np
-from typing import Dict, List, Tuple, Optional
+from collections import Counter, OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from itertools import chain, islice
+from operator import itemgetter
+from typing import Dict, Iterable, Iterator, List, Tuple, Optional
+
+try:
+    import polars as pl
+except ImportError:  # Polars is optional; rule masks are evaluated with pandas without it
+    pl = None
+
+try:
+    from numba import njit
+except ImportError:  # Numba is optional; rule columns are classified with np.digitize without it
+    njit = None
+
+# Result lists, each of which max_results_per_category caps
+_RESULT_CATEGORIES = ('critical_outliers', 'warnings', 'impossible_values', 'suspicious_patterns')
+
+# Detection results kept per detector for recently validated tables
+_RESULT_CACHE_SIZE = 8
+
+# Frames at least this long check their fields on a thread pool (NumPy releases the GIL)
+PARALLEL_MIN_ROWS = 100_000
+FIELD_CHECK_WORKERS = min(8, os.cpu_count() or 1)
+
+# Field violation type -> (record detail key, rules key for its value, severity)
+_FIELD_VIOLATIONS = {
+    'below_minimum': ('expected_min', 'min', 'critical'),
+    'above_maximum': ('expected_max', 'max', 'critical'),
+    'below_typical': ('typical_range', 'typical_range', 'warning'),
+    'above_typical': ('typical_range', 'typical_range', 'warning')
+}
+
+# Fields that must not have min > max
+_MIN_MAX_PAIRS = [
+    ('thc_percentage_min', 'thc_percentage_max'),
+    ('cbd_percentage_min', 'cbd_percentage_max'),
+    ('height_cm_min', 'height_cm_max'),
+    ('flowering_days_min', 'flowering_days_max'),
+    ('yield_grams_per_m2_min', 'yield_grams_per_m2_max')
+]
+
+# Fields the suspicious-pattern checks look at
+_ROUND_NUMBER_FIELDS = ['thc_percentage_min', 'thc_percentage_max', 'cbd_percentage_min', 'cbd_percentage_max']
+_DUPLICATE_KEY_FIELDS = ['thc_percentage_max', 'cbd_percentage_max', 'flowering_days_max']
+
+# Columns the combination checks add together; they keep their dtype so sums don't round or overflow
+_ARITHMETIC_COLUMNS = {'sativa_percentage', 'indica_percentage'}
+
+# Every column the impossible-combination checks read
+_COMBINATION_COLUMNS = {field for pair in _MIN_MAX_PAIRS for field in pair} | {
+    'sativa_percentage', 'indica_percentage', 'thc_percentage_max', 'cbd_percentage_max'
+}
+
+def _is_plain_numeric(values: pd.Series) -> bool:
+    """NumPy int/float column (no nullable extension dtypes, bools or objects)"""
+    return isinstance(values.dtype, np.dtype) and values.dtype.kind in 'iuf'
+
+def _fresh_copy(value):
+    """Copy of nested dicts and lists, sharing only the scalar leaves"""
+    if isinstance(value, dict):
+        return {key: _fresh_copy(item) for key, item in value.items()}
+    if isinstance(value, list):
+        return [_fresh_copy(item) for item in value]
+    return value
+
+def _classify_values(values: np.ndarray, bounds: np.ndarray, nan_bin: int) -> np.ndarray:
+    """
+    np.digitize(values, bounds) for ascending bounds as int8, with NaN put in nan_bin;
+    one comparison pass per value instead of a binary search plus a NaN fixup
+    """
+    out = np.empty(values.size, np.int8)
+    for i in range(values.size):
+        value = values[i]
+        if np.isnan(value):
+            out[i] = nan_bin
+        else:
+            bin_index = 0
+            for bound in bounds:
+                if value >= bound:
+                    bin_index += 1
+            out[i] = bin_index
+    return out
+
+# Compiled without the GIL so the field-check threads can classify columns at the same time
+_classify_kernel = njit(nogil=True)(_classify_values) if njit is not None else None
+
+def _round_fraction(values: np.ndarray, step: int = 5) -> Tuple[int, int]:
+    """(exact multiples of step, non-missing values) in a numeric array, without temporary Series"""
+    if values.dtype.kind == 'f':
+        # fmod is exact, and NaN never compares equal to 0
+        round_count = np.count_nonzero(np.fmod(values, step) == 0)
+        return int(round_count), len(values) - int(np.count_nonzero(np.isnan(values)))
+    return int(np.count_nonzero(values % step == 0)), len(values)
 
 class CannabisOutlierDetector:
     """
@@ -33,71 +129,720 @@ class CannabisOutlierDetector:
             'critical_outliers': 0,
             'warnings': 0
         }
+        
+        self._result_cache = OrderedDict()
+        
+        # Rules expanded into concrete per-column checks; rebuilt only if validation_rules is edited
+        self._rules_signature = None
+        self._compiled_rules = {}
+        self._float32_thresholds = False
+        self._compiled_program()
     
-    def detect_outliers(self, df: pd.DataFrame) -> Dict:
+    def detect_outliers(self, df: pd.DataFrame, use_cache: bool = True,
+                        max_results_per_category: Optional[int] = None) -> Dict:
         """
         Main outlier detection method
         Returns comprehensive outlier analysis
+        
+        With max_results_per_category, each result list keeps only its first records;
+        the rest are still counted in the summary (truncated_counts says how many were dropped)
+        """
+        # Wide tables carry descriptions, URLs etc. that no check reads
+        df = self._coerce_numeric(df[self._relevant_columns(df)])
+        
+        # Revalidating an unchanged table (report or dashboard refresh) reuses the earlier run
+        fingerprint = self._fingerprint(df) if use_cache else None
+        cache_key = (fingerprint, max_results_per_category) if fingerprint is not None else None
+        cached = self._result_cache.get(cache_key) if cache_key is not None else None
+        if cached is None:
+            cached = (self._detect_outliers(df, max_results_per_category), dict(self.outlier_stats))
+            if cache_key is not None:
+                self._result_cache[cache_key] = cached
+                if len(self._result_cache) > _RESULT_CACHE_SIZE:
+                    self._result_cache.popitem(last=False)
+        else:
+            self._result_cache.move_to_end(cache_key)
+        
+        outlier_results, outlier_stats = cached
+        self.outlier_stats.update(outlier_stats)
+        
+        # Fresh containers, records included, so callers can't edit the cached copy
+        return _fresh_copy(outlier_results)
+    
+    def _needed_columns(self) -> set:
+        """Every column some check reads"""
+        needed = {'strain_name'} | _COMBINATION_COLUMNS
+        for field in self.validation_rules:
+            needed.update((field, f"{field}_min", f"{field}_max"))
+        return needed
+    
+    def _relevant_columns(self, df: pd.DataFrame) -> List[str]:
+        """Columns of df that some check reads, in df's order"""
+        needed = self._needed_columns()
+        return [column for column in df.columns if column in needed]
+    
+    def _coerce_numeric(self, df: pd.DataFrame) -> pd.DataFrame:
+        """
+        df with text-typed rule columns (scraped values such as '18' or 'unknown') parsed as
+        numbers, unparseable entries becoming NaN; numeric columns are left untouched
         """
+        coerced = {
+            column: pd.to_numeric(df[column].astype(object), errors='coerce')
+            for column in df.columns
+            if column != 'strain_name' and (df[column].dtype == object or pd.api.types.is_string_dtype(df[column]))
+        }
+        return df.assign(**coerced) if coerced else df
+    
+    def _fingerprint(self, df: pd.DataFrame) -> Optional[bytes]:
+        """Digest of the table (values, index, columns, dtypes) and the current rules, or None if unhashable"""
+        try:
+            row_hashes = pd.util.hash_pandas_object(df, index=True).to_numpy()
+        except TypeError:
+            return None
+        digest = hashlib.blake2b(row_hashes.tobytes(), digest_size=16)
+        digest.update(repr((list(df.columns), [str(dtype) for dtype in df.dtypes], self.validation_rules)).encode())
+        return digest.digest()
+    
+    def _detect_outliers(self, df: pd.DataFrame, cap: Optional[int] = None) -> Dict:
+        """Uncached detect_outliers"""
         self.outlier_stats['total_records'] = len(df)
         
-        outlier_results = {
+        outlier_results = self._empty_results()
+        truncated = {category: Counter() for category in _RESULT_CATEGORIES}
+        self._check_rows(df, outlier_results, truncated, cap)
+        
+        # Check for suspicious patterns
+        pattern_outliers = self._check_suspicious_patterns(df)
+        self._collect(outlier_results, truncated, 'suspicious_patterns', pattern_outliers, cap)
+        
+        # Generate summary statistics
+        outlier_results['summary'] = self._generate_summary(outlier_results, truncated if cap is not None else None)
+        
+        return outlier_results
+    
+    def detect_outliers_iter(self, chunks: Iterable[pd.DataFrame], row_offset: Optional[int] = None,
+                             max_results_per_category: Optional[int] = None) -> Dict:
+        """
+        detect_outliers over a stream of chunks (read_csv(chunksize=...), Parquet batches)
+        so the whole table never has to be in memory at once
+        
+        Row checks run per chunk; round-number and duplicate patterns are judged on
+        counts and row hashes accumulated over every chunk. With row_offset, rows are
+        numbered positionally from that value; otherwise each chunk's index labels are reported.
+        
+        The summary and the set of records match detect_outliers on the concatenated table,
+        but row records come out grouped by chunk, so list order may differ. For the same
+        reason, max_results_per_category keeps the first records in that order, which may
+        not be the ones detect_outliers keeps; the counts still agree.
+        """
+        cap = max_results_per_category
+        outlier_results = self._empty_results()
+        truncated = {category: Counter() for category in _RESULT_CATEGORIES}
+        round_counts = {}
+        duplicate_key_hashes = []
+        total_records = 0
+        
+        for chunk in chunks:
+            chunk = self._coerce_numeric(chunk[self._relevant_columns(chunk)])
+            if row_offset is not None:
+                start = row_offset + total_records
+                chunk = chunk.set_axis(pd.RangeIndex(start, start + len(chunk)))
+            total_records += len(chunk)
+            
+            self._check_rows(chunk, outlier_results, truncated, cap)
+            
+            for field, (round_values, total_values) in self._round_counts(chunk).items():
+                running_round, running_total = round_counts.get(field, (0, 0))
+                round_counts[field] = (running_round + round_values, running_total + total_values)
+            key_fields = [field for field in _DUPLICATE_KEY_FIELDS if field in chunk.columns]
+            if len(key_fields) >= 2:
+                duplicate_key_hashes.append(self._row_hashes(chunk, key_fields).to_numpy())
+        
+        duplicate_count = None
+        if total_records > 100 and duplicate_key_hashes:
+            duplicate_count = int(pd.Series(np.concatenate(duplicate_key_hashes)).duplicated(keep=False).sum())
+        pattern_outliers = self._suspicious_patterns(round_counts, duplicate_count, total_records)
+        self._collect(outlier_results, truncated, 'suspicious_patterns', pattern_outliers, cap)
+        
+        self.outlier_stats['total_records'] = total_records
+        outlier_results['summary'] = self._generate_summary(outlier_results, truncated if cap is not None else None)
+        return outlier_results
+    
+    def detect_outliers_parquet(self, path: str, batch_size: int = 100_000,
+                                max_results_per_category: Optional[int] = None) -> Dict:
+        """detect_outliers_iter over a Parquet file's record batches, reading only the validated columns"""
+        import pyarrow.parquet as pq
+        
+        parquet_file = pq.ParquetFile(path)
+        needed = self._needed_columns()
+        columns = [column for column in parquet_file.schema_arrow.names if column in needed]
+        batches = parquet_file.iter_batches(batch_size=batch_size, columns=columns)
+        return self.detect_outliers_iter(
+            (batch.to_pandas() for batch in batches), row_offset=0, max_results_per_category=max_results_per_category
+        )
+    
+    def _empty_results(self) -> Dict:
+        """Result skeleton the checks append to"""
+        return {
             'critical_outliers': [],
             'warnings': [],
             'impossible_values': [],
             'suspicious_patterns': [],
             'summary': {}
         }
+    
+    def _check_rows(self, df: pd.DataFrame, outlier_results: Dict, truncated: Dict, cap: Optional[int] = None):
+        """
+        Append the per-row field and combination violations in df to outlier_results,
+        keeping at most cap records per list and tallying the severities of the rest in truncated
+        """
         
-        # Check each validation rule
-        for field, rules in self.validation_rules.items():
-            if field in df.columns:
-                field_outliers = self._check_field_outliers(df, field, rules)
-                if field_outliers:
-                    outlier_results['critical_outliers'].extend(field_outliers)
+        plan = self._check_plan(df)
         
-        # Check for impossible combinations
-        combination_outliers = self._check_impossible_combinations(df)
-        outlier_results['impossible_values'].extend(combination_outliers)
+        # With Polars installed, every rule mask comes out of one fused query
+        field_masks, combination_masks = self._lazy_masks(df, plan) if pl is not None else ({}, None)
         
-        # Check for suspicious patterns
-        pattern_outliers = self._check_suspicious_patterns(df)
-        outlier_results['suspicious_patterns'].extend(pattern_outliers)
+        # Check each rule column; the checks are independent and don't touch self
+        strain_names = self._strain_names(df)
+        if len(df) >= PARALLEL_MIN_ROWS and FIELD_CHECK_WORKERS > 1:
+            # Workers drain their own generators; results keep rule order whichever way they ran
+            with ThreadPoolExecutor(max_workers=FIELD_CHECK_WORKERS) as executor:
+                combination_future = executor.submit(
+                    self._take, self._check_impossible_combinations(df, combination_masks, strain_names), cap
+                )
+                field_futures = [
+                    executor.submit(self._take, self._check_column_outliers(df, *check, field_masks, strain_names), cap)
+                    for check in plan
+                ]
+                for future in field_futures:
+                    kept, dropped = future.result()
+                    self._collect(outlier_results, truncated, 'critical_outliers', kept, cap, dropped)
+                kept, dropped = combination_future.result()
+                self._collect(outlier_results, truncated, 'impossible_values', kept, cap, dropped)
+        else:
+            for check in plan:
+                outliers = self._check_column_outliers(df, *check, field_masks, strain_names)
+                self._collect(outlier_results, truncated, 'critical_outliers', outliers, cap)
+            
+            # Check for impossible combinations
+            combination_outliers = self._check_impossible_combinations(df, combination_masks, strain_names)
+            self._collect(outlier_results, truncated, 'impossible_values', combination_outliers, cap)
+    
+    def _take(self, outliers: Iterator[Dict], cap: Optional[int]) -> Tuple[List[Dict], Counter]:
+        """(first cap records of outliers, severity counts of the rest)"""
+        kept = list(islice(outliers, cap))
+        return kept, Counter(map(itemgetter('severity'), outliers))
+    
+    def _collect(self, outlier_results: Dict, truncated: Dict, category: str, outliers: Iterable[Dict],
+                 cap: Optional[int] = None, dropped: Optional[Counter] = None):
+        """
+        Extend outlier_results[category] from outliers until it holds cap records;
+        the severities of records past the cap (and any already dropped) go to truncated[category]
+        """
+        bucket = outlier_results[category]
+        if cap is None:
+            bucket.extend(outliers)
+            return
         
-        # Generate summary statistics
-        outlier_results['summary'] = self._generate_summary(outlier_results)
+        outliers = iter(outliers)
+        bucket.extend(islice(outliers, max(cap - len(bucket), 0)))
+        truncated[category].update(map(itemgetter('severity'), outliers))
+        if dropped:
+            truncated[category].update(dropped)
+    
+    def _lazy_masks(self, df: pd.DataFrame, plan: List[Tuple]) -> Tuple[Dict, Dict]:
+        """
+        Evaluate every field and combination mask in a single Polars select
+        Returns ({check_field: {violation_type: mask}}, {combination: mask} or None);
+        only numeric columns go to Polars, anything else is left to the pandas checks
+        """
+        numeric_columns = [column for column in df.columns if _is_plain_numeric(df[column])]
+        numeric_set = set(numeric_columns)
+        expressions = {}
+        for check_field, rules, _ in plan:
+            if check_field in numeric_set:
+                for violation_type, mask in self._field_masks(pl.col(check_field), rules).items():
+                    expressions[('field', check_field, violation_type)] = mask
         
-        return outlier_results
+        # Combination checks mix columns, so they move to Polars only when all of theirs are numeric
+        combinations_in_polars = _COMBINATION_COLUMNS.intersection(df.columns) <= numeric_set
+        if combinations_in_polars:
+            for combination, mask in self._combination_masks(pl.col, numeric_set).items():
+                expressions[('combination', combination)] = mask
+        
+        field_masks = {}
+        combination_masks = {} if combinations_in_polars else None
+        if not expressions:
+            return field_masks, combination_masks
+        
+        # NaN becomes null on the way in, and null comparisons count as no violation (as NaN does in pandas)
+        # Narrow dtypes halve (or better) what Polars copies in and scans
+        lf = pl.from_pandas(self._narrow_dtypes(df[numeric_columns]), include_index=False).lazy()
+        names = [f"mask_{i}" for i in range(len(expressions))]
+        result = lf.select([
+            mask.fill_null(False).alias(name) for mask, name in zip(expressions.values(), names)
+        ]).collect()
+        
+        for key, name in zip(expressions, names):
+            if key[0] == 'field':
+                field_masks.setdefault(key[1], {})[key[2]] = result[name]
+            else:
+                combination_masks[key[1]] = result[name]
+        return field_masks, combination_masks
+    
+    def _narrow_dtypes(self, df: pd.DataFrame) -> pd.DataFrame:
+        """
+        df with numeric columns cast to the smallest dtype that holds every value exactly
+        (ints downcast, floats to float32 when lossless); only mask inputs go through this
+        """
+        narrowed = {}
+        for column in df.columns:
+            values = df[column]
+            if column in _ARITHMETIC_COLUMNS or not _is_plain_numeric(values):
+                continue
+            if values.dtype.kind in 'iu':
+                narrow = pd.to_numeric(values, downcast='integer')
+            elif self._float32_thresholds and values.dtype.itemsize > 4:
+                narrow = values.astype(np.float32)
+                if not np.array_equal(narrow.to_numpy(), values.to_numpy(), equal_nan=True):
+                    continue
+            else:
+                continue
+            if narrow.dtype != values.dtype:
+                narrowed[column] = narrow
+        return df.assign(**narrowed) if narrowed else df
     
-    def _check_field_outliers(self, df: pd.DataFrame, field: str, rules: Dict) -> List[Dict]:
-        """Check individual field for outliers"""
-        outliers = []
+    def _field_masks(self, column, rules: Dict) -> Dict:
+        """Violation type -> mask for one field; column is a pandas Series or a Polars expression"""
+        masks = {}
+        if 'min' in rules:
+            masks['below_minimum'] = column < rules['min']
+        if 'max' in rules:
+            masks['above_maximum'] = column > rules['max']
+        if 'typical_range' in rules:
+            typical_min, typical_max = rules['typical_range']
+            masks['below_typical'] = (column >= rules.get('min', 0)) & (column < typical_min)
+            masks['above_typical'] = (column <= rules.get('max', float('inf'))) & (column > typical_max)
+        return masks
+    
+    def _compiled_program(self) -> Dict:
+        """field -> compiled rule for the current validation_rules"""
+        signature = repr(self.validation_rules)
+        if signature != self._rules_signature:
+            self._compiled_rules = {
+                field: self._compile_rule(field, rules) for field, rules in self.validation_rules.items()
+            }
+            # Polars compares a float32 column against literals in float32, so floats
+            # may only be narrowed while every threshold is exact in float32
+            thresholds = [
+                bound
+                for rules in self.validation_rules.values()
+                for key, value in rules.items() if key in ('min', 'max', 'typical_range')
+                for bound in (value if isinstance(value, tuple) else (value,))
+            ]
+            self._float32_thresholds = all(float(np.float32(bound)) == bound for bound in thresholds)
+            self._rules_signature = signature
+        return self._compiled_rules
+    
+    def _compile_rule(self, field: str, rules: Dict) -> Dict:
+        """
+        Expand one rule into what the field checks need: the columns to read, each
+        violation's record details, and digitize bounds when the rule has a full ordered set
+        """
+        violations = {
+            violation_type: (detail_key, rules[rules_key], severity)
+            for violation_type, (detail_key, rules_key, severity) in _FIELD_VIOLATIONS.items()
+            if rules_key in rules
+        }
+        compiled = {
+            'check_fields': (f"{field}_min", f"{field}_max", field),
+            'violations': violations,
+            'bounds': None
+        }
+        if 'min' not in rules or 'max' not in rules:
+            return compiled
+        
+        # Lower bounds are inclusive (value >= bound) and upper ones exclusive (value > bound);
+        # nudging the upper bounds up by one ulp lets a single right=False digitize handle both
+        if 'typical_range' in rules:
+            typical_min, typical_max = rules['typical_range']
+            bounds = [rules['min'], typical_min, np.nextafter(typical_max, np.inf), np.nextafter(rules['max'], np.inf)]
+            bin_types = ['below_minimum', 'below_typical', None, 'above_typical', 'above_maximum']
+        else:
+            bounds = [rules['min'], np.nextafter(rules['max'], np.inf)]
+            bin_types = ['below_minimum', None, 'above_maximum']
+        if any(low > high for low, high in zip(bounds, bounds[1:])):
+            return compiled
+        
+        compiled['bounds'] = np.array(bounds, dtype=np.float64)
+        compiled['in_range_bin'] = bin_types.index(None)
+        compiled['violation_bins'] = {violation_type: bin_types.index(violation_type) for violation_type in violations}
+        return compiled
+    
+    def _column_field_masks(self, column: pd.Series, rules: Dict, compiled: Dict) -> Dict:
+        """
+        _field_masks for a pandas column; numeric columns whose rule compiled to digitize
+        bounds are classified against every bound in one pass (the Numba kernel, or np.digitize)
+        """
+        if compiled['bounds'] is None or not _is_plain_numeric(column):
+            return self._field_masks(column, rules)
+        
+        values = column.to_numpy(dtype=np.float64)
+        if _classify_kernel is not None:
+            bins = _classify_kernel(values, compiled['bounds'], compiled['in_range_bin'])
+        else:
+            bins = np.digitize(values, compiled['bounds'])
+            bins[np.isnan(values)] = compiled['in_range_bin']  # NaN never violates a rule
+        return {violation_type: bins == bin_index for violation_type, bin_index in compiled['violation_bins'].items()}
+    
+    def _combination_masks(self, col, columns) -> Dict:
+        """
+        Masks for the impossible-combination checks whose columns are all in columns
+        col maps a column name to a pandas Series or a Polars expression
+        """
+        masks = {}
+        for min_field, max_field in _MIN_MAX_PAIRS:
+            if min_field in columns and max_field in columns:
+                masks[(min_field, max_field)] = col(min_field) > col(max_field)
+        
+        # Missing values compare False, so they never count as a violation
+        if 'sativa_percentage' in columns and 'indica_percentage' in columns:
+            masks['genetics_not_100_percent'] = abs(col('sativa_percentage') + col('indica_percentage') - 100) > 1  # Allow 1% tolerance
+        
+        if 'thc_percentage_max' in columns and 'cbd_percentage_max' in columns:
+            masks['high_thc_and_cbd'] = (col('thc_percentage_max') > 20) & (col('cbd_percentage_max') > 15)
+        
+        return masks
+    
+    def _check_field_outliers(self, df: pd.DataFrame, field: str, rules: Dict, masks: Optional[Dict] = None,
+                              strain_names: Optional[np.ndarray] = None) -> Iterator[Dict]:
+        """Check individual field for outliers, yielding one record per violation"""
+        if strain_names is None:
+            strain_names = self._strain_names(df)
+        compiled = self._compiled_program()[field]
+        columns = set(df.columns)
         
         # Handle min/max fields (e.g., thc_percentage_min, thc_percentage_max)
-        min_field = f"{field}_min"
-        max_field = f"{field}_max"
-        
-        fields_to_check = []
-        if min_field in df.columns:
-            fields_to_check.append(min_field)
-        if max_field in df.columns:
-            fields_to_check.append(max_field)
-        if field in df.columns:
-            fields_to_check.append(field)
-        
-        for check_field in fields_to_check:
-            if check_field not in df.columns:
-                continue
-                
-            # Check minimum values
-            if 'min' in rules:
-                min_violations = df[df[check_field] < rules['min']].index.tolist()
-                for idx in min_violations:
-                    outliers.append({
+        for check_field in compiled['check_fields']:
+            if check_field in columns:
+                yield from self._check_column_outliers(df, check_field, rules, compiled, masks, strain_names)
+    
+    def _check_plan(self, df: pd.DataFrame) -> List[Tuple[str, Dict, Dict]]:
+        """
+        (check_field, rules, compiled rule) for every rule column present in df, in report order;
+        resolves column membership once per frame instead of inside each check
+        """
+        columns = set(df.columns)
+        program = self._compiled_program()
+        return [
+            (check_field, rules, program[field])
+            for field, rules in self.validation_rules.items() if field in columns
+            for check_field in program[field]['check_fields'] if check_field in columns
+        ]
+    
+    def _check_column_outliers(self, df: pd.DataFrame, check_field: str, rules: Dict, compiled: Dict,
+                               masks: Optional[Dict], strain_names: np.ndarray) -> Iterator[Dict]:
+        """Records for one rule column (the field itself or its _min/_max), yielding one per violation"""
+        check_masks = masks.get(check_field) if masks else None
+        if check_masks is None:
+            check_masks = self._column_field_masks(df[check_field], rules, compiled)
+        
+        violations = compiled['violations']
+        for violation_type, mask in check_masks.items():
+            detail_key, detail_value, severity = violations[violation_type]
+            for idx, strain_name, value in self._violating_rows(df, mask, strain_names, check_field):
+                yield {
+                    'row_index': idx,
+                    'field': check_field,
+                    'value': value,
+                    'violation_type': violation_type,
+                    detail_key: detail_value,
+                    'severity': severity,
+                    'strain_name': strain_name
+                }
+    
+    def _strain_names(self, df: pd.DataFrame) -> np.ndarray:
+        """Strain name per row position ('Unknown' throughout if df has no strain_name column)"""
+        if 'strain_name' in df.columns:
+            return df['strain_name'].to_numpy()
+        return np.full(len(df), 'Unknown', dtype=object)
+    
+    def _violating_rows(self, df: pd.DataFrame, mask: pd.Series, strain_names: np.ndarray, *fields: str):
+        """
+        (row_index, strain_name, *field values) for each row where mask is True
+        Gathers whole columns at once instead of a .loc lookup per cell
+        """
+        if isinstance(mask, pd.Series):
+            # Masks from nullable (Int64, Float64, ...) columns hold NA, which never counts as a violation
+            mask = mask.fillna(False)
+        positions = np.flatnonzero(np.asarray(mask, dtype=bool))
+        values = [df[field].to_numpy()[positions] for field in fields]
+        return zip(df.index[positions].tolist(), strain_names[positions], *values)
+    
+    def _column_getter(self, df: pd.DataFrame):
+        """
+        Column lookup for the mask builders: raw ndarrays for numeric columns so the
+        comparisons are plain ufuncs, the Series otherwise (keeps pandas' object-dtype handling)
+        """
+        def col(column):
+            values = df[column]
+            return values.to_numpy() if _is_plain_numeric(values) else values
+        return col
+    
+    def _check_impossible_combinations(self, df: pd.DataFrame, masks: Optional[Dict] = None,
+                                       strain_names: Optional[np.ndarray] = None) -> Iterator[Dict]:
+        """Check for impossible combinations of values, yielding one record per violation"""
+        if strain_names is None:
+            strain_names = self._strain_names(df)
+        
+        if masks is None:
+            masks = self._combination_masks(self._column_getter(df), set(df.columns))
+        
+        # Check if min > max for any field
+        for min_field, max_field in _MIN_MAX_PAIRS:
+            if (min_field, max_field) in masks:
+                mask = masks[(min_field, max_field)]
+                for idx, strain_name, min_value, max_value in self._violating_rows(df, mask, strain_names, min_field, max_field):
+                    yield {
                         'row_index': idx,
-                        'field': check_field,
-                        'value': df.loc[idx, check_field],
-                        'violation_type': 'below_minimum',
-                        'expected_min': rules['min'],
+                        'violation_type': 'min_greater_than_max',
+                        'fields': [min_field, max_field],
+                        'min_value': min_value,
+                        'max_value': max_value,
                         'severity': 'critical',
-                        'strain_name': df.loc[idx].get('strain_name', 'Unknown')\n                    })\n            \n            # Check maximum values\n            if 'max' in rules:\n                max_violations = df[df[check_field] > rules['max']].index.tolist()\n                for idx in max_violations:\n                    outliers.append({\n                        'row_index': idx,\n                        'field': check_field,\n                        'value': df.loc[idx, check_field],\n                        'violation_type': 'above_maximum',\n                        'expected_max': rules['max'],\n                        'severity': 'critical',\n                        'strain_name': df.loc[idx].get('strain_name', 'Unknown')\n                    })\n            \n            # Check typical range warnings\n            if 'typical_range' in rules:\n                typical_min, typical_max = rules['typical_range']\n                \n                # Below typical range\n                below_typical = df[\n                    (df[check_field] >= rules.get('min', 0)) & \n                    (df[check_field] < typical_min)\n                ].index.tolist()\n                \n                for idx in below_typical:\n                    outliers.append({\n                        'row_index': idx,\n                        'field': check_field,\n                        'value': df.loc[idx, check_field],\n                        'violation_type': 'below_typical',\n                        'typical_range': rules['typical_range'],\n                        'severity': 'warning',\n                        'strain_name': df.loc[idx].get('strain_name', 'Unknown')\n                    })\n                \n                # Above typical range\n                above_typical = df[\n                    (df[check_field] <= rules.get('max', float('inf'))) & \n                    (df[check_field] > typical_max)\n                ].index.tolist()\n                \n                for idx in above_typical:\n                    outliers.append({\n                        'row_index': idx,\n                        'field': check_field,\n                        'value': df.loc[idx, check_field],\n                        'violation_type': 'above_typical',\n                        'typical_range': rules['typical_range'],\n                        'severity': 'warning',\n                        'strain_name': df.loc[idx].get('strain_name', 'Unknown')\n                    })\n        \n        return outliers\n    \n    def _check_impossible_combinations(self, df: pd.DataFrame) -> List[Dict]:\n        \"\"\"Check for impossible combinations of values\"\"\"\n        impossible_values = []\n        \n        # Check if min > max for any field\n        min_max_pairs = [\n            ('thc_percentage_min', 'thc_percentage_max'),\n            ('cbd_percentage_min', 'cbd_percentage_max'),\n            ('height_cm_min', 'height_cm_max'),\n            ('flowering_days_min', 'flowering_days_max'),\n            ('yield_grams_per_m2_min', 'yield_grams_per_m2_max')\n        ]\n        \n        for min_field, max_field in min_max_pairs:\n            if min_field in df.columns and max_field in df.columns:\n                violations = df[df[min_field] > df[max_field]].index.tolist()\n                for idx in violations:\n                    impossible_values.append({\n                        'row_index': idx,\n                        'violation_type': 'min_greater_than_max',\n                        'fields': [min_field, max_field],\n                        'min_value': df.loc[idx, min_field],\n                        'max_value': df.loc[idx, max_field],\n                        'severity': 'critical',\n                        'strain_name': df.loc[idx].get('strain_name', 'Unknown')\n                    })\n        \n        # Check if sativa + indica != 100%\n        if 'sativa_percentage' in df.columns and 'indica_percentage' in df.columns:\n            genetics_violations = df[\n                (df['sativa_percentage'].notna()) & \n                (df['indica_percentage'].notna()) &\n                (abs(df['sativa_percentage'] + df['indica_percentage'] - 100) > 1)  # Allow 1% tolerance\n            ].index.tolist()\n            \n            for idx in genetics_violations:\n                sativa = df.loc[idx, 'sativa_percentage']\n                indica = df.loc[idx, 'indica_percentage']\n                total = sativa + indica\n                \n                impossible_values.append({\n                    'row_index': idx,\n                    'violation_type': 'genetics_not_100_percent',\n                    'sativa_percentage': sativa,\n                    'indica_percentage': indica,\n                    'total_percentage': total,\n                    'severity': 'warning' if abs(total - 100) <= 5 else 'critical',\n                    'strain_name': df.loc[idx].get('strain_name', 'Unknown')\n                })\n        \n        # Check for impossible THC + CBD combinations (very high both)\n        if 'thc_percentage_max' in df.columns and 'cbd_percentage_max' in df.columns:\n            high_both = df[\n                (df['thc_percentage_max'] > 20) & \n                (df['cbd_percentage_max'] > 15)\n            ].index.tolist()\n            \n            for idx in high_both:\n                impossible_values.append({\n                    'row_index': idx,\n                    'violation_type': 'high_thc_and_cbd',\n                    'thc_max': df.loc[idx, 'thc_percentage_max'],\n                    'cbd_max': df.loc[idx, 'cbd_percentage_max'],\n                    'severity': 'warning',\n                    'strain_name': df.loc[idx].get('strain_name', 'Unknown'),\n                    'note': 'Rare but possible - verify source data'\n                })\n        \n        return impossible_values\n    \n    def _check_suspicious_patterns(self, df: pd.DataFrame) -> List[Dict]:\n        \"\"\"Check for suspicious patterns that might indicate AI hallucination\"\"\"\n        suspicious_patterns = []\n        \n        # Check for too many perfect round numbers\n        numeric_fields = ['thc_percentage_min', 'thc_percentage_max', 'cbd_percentage_min', 'cbd_percentage_max']\n        \n        for field in numeric_fields:\n            if field in df.columns:\n                # Count values that are perfect multiples of 5\n                round_values = df[df[field] % 5 == 0][field].count()\n                total_values = df[field].notna().sum()\n                \n                if total_values > 0:\n                    round_percentage = (round_values / total_values) * 100\n                    \n                    if round_percentage > 80:  # More than 80% are round numbers\n                        suspicious_patterns.append({\n                            'pattern_type': 'too_many_round_numbers',\n                            'field': field,\n                            'round_percentage': round_percentage,\n                            'total_values': total_values,\n                            'severity': 'warning',\n                            'note': 'High percentage of round numbers may indicate AI estimation'\n                        })\n        \n        # Check for duplicate impossible combinations\n        if len(df) > 100:  # Only check for larger datasets\n            # Look for exact duplicates in key fields\n            key_fields = ['thc_percentage_max', 'cbd_percentage_max', 'flowering_days_max']\n            available_fields = [f for f in key_fields if f in df.columns]\n            \n            if len(available_fields) >= 2:\n                duplicates = df.duplicated(subset=available_fields, keep=False)\n                duplicate_count = duplicates.sum()\n                \n                if duplicate_count > len(df) * 0.1:  # More than 10% duplicates\n                    suspicious_patterns.append({\n                        'pattern_type': 'high_duplicate_rate',\n                        'duplicate_count': duplicate_count,\n                        'total_records': len(df),\n                        'duplicate_percentage': (duplicate_count / len(df)) * 100,\n                        'severity': 'warning',\n                        'note': 'High duplicate rate in key fields may indicate data quality issues'\n                    })\n        \n        return suspicious_patterns\n    \n    def _generate_summary(self, outlier_results: Dict) -> Dict:\n        \"\"\"Generate summary statistics for outlier detection\"\"\"\n        total_outliers = (\n            len(outlier_results['critical_outliers']) + \n            len(outlier_results['impossible_values'])\n        )\n        \n        critical_count = sum(\n            1 for outlier in outlier_results['critical_outliers'] \n            if outlier.get('severity') == 'critical'\n        ) + sum(\n            1 for outlier in outlier_results['impossible_values']\n            if outlier.get('severity') == 'critical'\n        )\n        \n        warning_count = sum(\n            1 for outlier in outlier_results['critical_outliers']\n            if outlier.get('severity') == 'warning'\n        ) + sum(\n            1 for outlier in outlier_results['impossible_values']\n            if outlier.get('severity') == 'warning'\n        )\n        \n        self.outlier_stats['outliers_found'] = total_outliers\n        self.outlier_stats['critical_outliers'] = critical_count\n        self.outlier_stats['warnings'] = warning_count\n        \n        return {\n            'total_records': self.outlier_stats['total_records'],\n            'total_outliers': total_outliers,\n            'critical_outliers': critical_count,\n            'warnings': warning_count,\n            'clean_records': self.outlier_stats['total_records'] - total_outliers,\n            'outlier_percentage': (total_outliers / self.outlier_stats['total_records'] * 100) if self.outlier_stats['total_records'] > 0 else 0,\n            'data_quality_score': max(0, 100 - (total_outliers / self.outlier_stats['total_records'] * 100)) if self.outlier_stats['total_records'] > 0 else 0\n        }\n    \n    def generate_report(self, outlier_results: Dict) -> str:\n        \"\"\"Generate a human-readable outlier detection report\"\"\"\n        report = []\n        report.append(\"=== CANNABIS STRAIN DATA OUTLIER DETECTION REPORT ===\")\n        report.append(\"\")\n        \n        summary = outlier_results['summary']\n        report.append(f\"Total Records Analyzed: {summary['total_records']}\")\n        report.append(f\"Clean Records: {summary['clean_records']} ({100 - summary['outlier_percentage']:.1f}%)\")\n        report.append(f\"Total Outliers: {summary['total_outliers']} ({summary['outlier_percentage']:.1f}%)\")\n        report.append(f\"  - Critical: {summary['critical_outliers']}\")\n        report.append(f\"  - Warnings: {summary['warnings']}\")\n        report.append(f\"Data Quality Score: {summary['data_quality_score']:.1f}/100\")\n        report.append(\"\")\n        \n        # Critical outliers section\n        if outlier_results['critical_outliers']:\n            report.append(\"CRITICAL OUTLIERS (Impossible Values):\")\n            for outlier in outlier_results['critical_outliers'][:10]:  # Show first 10\n                if outlier.get('severity') == 'critical':\n                    strain = outlier.get('strain_name', 'Unknown')\n                    field = outlier.get('field', 'Unknown')\n                    value = outlier.get('value', 'Unknown')\n                    violation = outlier.get('violation_type', 'Unknown')\n                    report.append(f\"  - {strain}: {field} = {value} ({violation})\")\n            \n            if len(outlier_results['critical_outliers']) > 10:\n                report.append(f\"  ... and {len(outlier_results['critical_outliers']) - 10} more\")\n            report.append(\"\")\n        \n        # Impossible combinations section\n        if outlier_results['impossible_values']:\n            report.append(\"IMPOSSIBLE VALUE COMBINATIONS:\")\n            for outlier in outlier_results['impossible_values'][:5]:  # Show first 5\n                strain = outlier.get('strain_name', 'Unknown')\n                violation = outlier.get('violation_type', 'Unknown')\n                report.append(f\"  - {strain}: {violation}\")\n            \n            if len(outlier_results['impossible_values']) > 5:\n                report.append(f\"  ... and {len(outlier_results['impossible_values']) - 5} more\")\n            report.append(\"\")\n        \n        # Suspicious patterns section\n        if outlier_results['suspicious_patterns']:\n            report.append(\"SUSPICIOUS PATTERNS:\")\n            for pattern in outlier_results['suspicious_patterns']:\n                pattern_type = pattern.get('pattern_type', 'Unknown')\n                note = pattern.get('note', '')\n                report.append(f\"  - {pattern_type}: {note}\")\n            report.append(\"\")\n        \n        report.append(\"=== END REPORT ===\")\n        \n        return \"\\n\".join(report)\n\ndef main():\n    \"\"\"Example usage of the Cannabis Outlier Detector\"\"\"\n    \n    # Create sample data with outliers\n    sample_data = {\n        'strain_name': ['Blue Dream', 'Impossible Strain', 'Normal Strain', 'Suspicious Strain'],\n        'thc_percentage_min': [18, 60, 15, 20],  # 60% is impossible\n        'thc_percentage_max': [24, 70, 20, 20],  # 70% is impossible\n        'cbd_percentage_min': [0.1, 0.1, 1.0, 0.5],\n        'cbd_percentage_max': [0.3, 0.2, 2.0, 1.0],\n        'height_cm_min': [120, 500, 80, 100],  # 500cm is impossible\n        'height_cm_max': [180, 600, 120, 150],  # 600cm is impossible\n        'flowering_days_min': [56, 200, 49, 63],  # 200 days is impossible\n        'flowering_days_max': [70, 250, 63, 70],  # 250 days is impossible\n        'sativa_percentage': [60, 70, 50, 60],\n        'indica_percentage': [40, 20, 50, 40],  # Second strain: 70+20=90% (not 100%)\n        'confidence_score': [4, 2, 5, 3]\n    }\n    \n    df = pd.DataFrame(sample_data)\n    \n    detector = CannabisOutlierDetector()\n    outlier_results = detector.detect_outliers(df)\n    \n    # Generate and print report\n    report = detector.generate_report(outlier_results)\n    print(report)\n\nif __name__ == \"__main__\":\n    main()
\ No newline at end of file
+                        'strain_name': strain_name
+                    }
+        
+        # Check if sativa + indica != 100%
+        if 'genetics_not_100_percent' in masks:
+            mask = masks['genetics_not_100_percent']
+            for idx, strain_name, sativa, indica in self._violating_rows(
+                df, mask, strain_names, 'sativa_percentage', 'indica_percentage'
+            ):
+                total = sativa + indica
+                
+                yield {
+                    'row_index': idx,
+                    'violation_type': 'genetics_not_100_percent',
+                    'sativa_percentage': sativa,
+                    'indica_percentage': indica,
+                    'total_percentage': total,
+                    'severity': 'warning' if abs(total - 100) <= 5 else 'critical',
+                    'strain_name': strain_name
+                }
+        
+        # Check for impossible THC + CBD combinations (very high both)
+        if 'high_thc_and_cbd' in masks:
+            mask = masks['high_thc_and_cbd']
+            for idx, strain_name, thc_max, cbd_max in self._violating_rows(
+                df, mask, strain_names, 'thc_percentage_max', 'cbd_percentage_max'
+            ):
+                yield {
+                    'row_index': idx,
+                    'violation_type': 'high_thc_and_cbd',
+                    'thc_max': thc_max,
+                    'cbd_max': cbd_max,
+                    'severity': 'warning',
+                    'strain_name': strain_name,
+                    'note': 'Rare but possible - verify source data'
+                }
+    
+    def _check_suspicious_patterns(self, df: pd.DataFrame) -> List[Dict]:
+        """Check for suspicious patterns that might indicate AI hallucination"""
+        duplicate_count = None
+        
+        # Check for duplicate impossible combinations
+        if len(df) > 100:  # Only check for larger datasets
+            # Look for exact duplicates in key fields
+            available_fields = [f for f in _DUPLICATE_KEY_FIELDS if f in df.columns]
+            if len(available_fields) >= 2:
+                duplicate_count = self._duplicate_count(df, available_fields)
+        
+        return self._suspicious_patterns(self._round_counts(df), duplicate_count, len(df))
+    
+    def _round_counts(self, df: pd.DataFrame) -> Dict:
+        """field -> (values that are perfect multiples of 5, non-missing values)"""
+        round_counts = {}
+        for field in _ROUND_NUMBER_FIELDS:
+            if field in df.columns:
+                if _is_plain_numeric(df[field]):
+                    round_counts[field] = _round_fraction(df[field].to_numpy())
+                else:
+                    round_counts[field] = (df[df[field] % 5 == 0][field].count(), df[field].notna().sum())
+        return round_counts
+    
+    def _suspicious_patterns(self, round_counts: Dict, duplicate_count: Optional[int], total_records: int) -> List[Dict]:
+        """Judge round-number counts and the key-field duplicate count against the pattern thresholds"""
+        suspicious_patterns = []
+        
+        # Check for too many perfect round numbers
+        for field, (round_values, total_values) in round_counts.items():
+            if total_values > 0:
+                round_percentage = (round_values / total_values) * 100
+                
+                if round_percentage > 80:  # More than 80% are round numbers
+                    suspicious_patterns.append({
+                        'pattern_type': 'too_many_round_numbers',
+                        'field': field,
+                        'round_percentage': round_percentage,
+                        'total_values': total_values,
+                        'severity': 'warning',
+                        'note': 'High percentage of round numbers may indicate AI estimation'
+                    })
+        
+        if duplicate_count is not None and duplicate_count > total_records * 0.1:  # More than 10% duplicates
+            suspicious_patterns.append({
+                'pattern_type': 'high_duplicate_rate',
+                'duplicate_count': duplicate_count,
+                'total_records': total_records,
+                'duplicate_percentage': (duplicate_count / total_records) * 100,
+                'severity': 'warning',
+                'note': 'High duplicate rate in key fields may indicate data quality issues'
+            })
+        
+        return suspicious_patterns
+    
+    def _duplicate_count(self, df: pd.DataFrame, fields: List[str]) -> int:
+        """Rows whose values in fields appear more than once"""
+        if not all(_is_plain_numeric(df[field]) for field in fields):
+            return df.duplicated(subset=fields, keep=False).sum()
+        
+        # Hash each row to one uint64 so duplicate detection is a single-column pass
+        return int(self._row_hashes(df, fields).duplicated(keep=False).sum())
+    
+    def _row_hashes(self, df: pd.DataFrame, fields: List[str]) -> pd.Series:
+        """One uint64 hash per row of df[fields]"""
+        keys = df[fields]
+        # One dtype per numeric column, so chunks read as int and as float hash alike;
+        # adding 0 turns -0.0 into 0.0, which duplicated() treats as equal
+        keys = keys.assign(**{
+            field: keys[field].astype(np.float64) + 0 for field in fields if _is_plain_numeric(keys[field])
+        })
+        return pd.util.hash_pandas_object(keys, index=False)
+    
+    def _generate_summary(self, outlier_results: Dict, truncated: Optional[Dict] = None) -> Dict:
+        """
+        Generate summary statistics for outlier detection
+        truncated (category -> severity counts of records left out of the lists) is added to the totals
+        """
+        total_outliers = (
+            len(outlier_results['critical_outliers']) + 
+            len(outlier_results['impossible_values'])
+        )
+        
+        # One pass over both lists; every record the checks build carries a severity
+        severity_counts = Counter(map(itemgetter('severity'), chain(
+            outlier_results['critical_outliers'], outlier_results['impossible_values']
+        )))
+        if truncated is not None:
+            for category in ('critical_outliers', 'impossible_values'):
+                severity_counts.update(truncated[category])
+                total_outliers += sum(truncated[category].values())
+        critical_count = severity_counts['critical']
+        warning_count = severity_counts['warning']
+        
+        self.outlier_stats['outliers_found'] = total_outliers
+        self.outlier_stats['critical_outliers'] = critical_count
+        self.outlier_stats['warnings'] = warning_count
+        
+        summary = {
+            'total_records': self.outlier_stats['total_records'],
+            'total_outliers': total_outliers,
+            'critical_outliers': critical_count,
+            'warnings': warning_count,
+            'clean_records': self.outlier_stats['total_records'] - total_outliers,
+            'outlier_percentage': (total_outliers / self.outlier_stats['total_records'] * 100) if self.outlier_stats['total_records'] > 0 else 0,
+            'data_quality_score': max(0, 100 - (total_outliers / self.outlier_stats['total_records'] * 100)) if self.outlier_stats['total_records'] > 0 else 0
+        }
+        if truncated is not None:
+            summary['truncated_counts'] = {category: sum(counts.values()) for category, counts in truncated.items()}
+        return summary
+    
+    def generate_report(self, outlier_results: Dict) -> str:
+        """Generate a human-readable outlier detection report"""
+        report = []
+        report.append("=== CANNABIS STRAIN DATA OUTLIER DETECTION REPORT ===")
+        report.append("")
+        
+        summary = outlier_results['summary']
+        truncated_counts = summary.get('truncated_counts', {})
+        report.append(f"Total Records Analyzed: {summary['total_records']}")
+        report.append(f"Clean Records: {summary['clean_records']} ({100 - summary['outlier_percentage']:.1f}%)")
+        report.append(f"Total Outliers: {summary['total_outliers']} ({summary['outlier_percentage']:.1f}%)")
+        report.append(f"  - Critical: {summary['critical_outliers']}")
+        report.append(f"  - Warnings: {summary['warnings']}")
+        report.append(f"Data Quality Score: {summary['data_quality_score']:.1f}/100")
+        report.append("")
+        
+        # Critical outliers section
+        if outlier_results['critical_outliers']:
+            report.append("CRITICAL OUTLIERS (Impossible Values):")
+            for outlier in outlier_results['critical_outliers'][:10]:  # Show first 10
+                if outlier.get('severity') == 'critical':
+                    strain = outlier.get('strain_name', 'Unknown')
+                    field = outlier.get('field', 'Unknown')
+                    value = outlier.get('value', 'Unknown')
+                    violation = outlier.get('violation_type', 'Unknown')
+                    report.append(f"  - {strain}: {field} = {value} ({violation})")
+            
+            more = max(len(outlier_results['critical_outliers']) - 10, 0) + truncated_counts.get('critical_outliers', 0)
+            if more > 0:
+                report.append(f"  ... and {more} more")
+            report.append("")
+        
+        # Impossible combinations section
+        if outlier_results['impossible_values']:
+            report.append("IMPOSSIBLE VALUE COMBINATIONS:")
+            for outlier in outlier_results['impossible_values'][:5]:  # Show first 5
+                strain = outlier.get('strain_name', 'Unknown')
+                violation = outlier.get('violation_type', 'Unknown')
+                report.append(f"  - {strain}: {violation}")
+            
+            more = max(len(outlier_results['impossible_values']) - 5, 0) + truncated_counts.get('impossible_values', 0)
+            if more > 0:
+                report.append(f"  ... and {more} more")
+            report.append("")
+        
+        # Suspicious patterns section
+        if outlier_results['suspicious_patterns']:
+            report.append("SUSPICIOUS PATTERNS:")
+            for pattern in outlier_results['suspicious_patterns']:
+                pattern_type = pattern.get('pattern_type', 'Unknown')
+                note = pattern.get('note', '')
+                report.append(f"  - {pattern_type}: {note}")
+            report.append("")
+        
+        report.append("=== END REPORT ===")
+        
+        return "\n".join(report)
+
+# Sample data with outliers for the example run
+_SAMPLE_DATA = {
+    'strain_name': ['Blue Dream', 'Impossible Strain', 'Normal Strain', 'Suspicious Strain'],
+    'thc_percentage_min': [18, 60, 15, 20],  # 60% is impossible
+    'thc_percentage_max': [24, 70, 20, 20],  # 70% is impossible
+    'cbd_percentage_min': [0.1, 0.1, 1.0, 0.5],
+    'cbd_percentage_max': [0.3, 0.2, 2.0, 1.0],
+    'height_cm_min': [120, 500, 80, 100],  # 500cm is impossible
+    'height_cm_max': [180, 600, 120, 150],  # 600cm is impossible
+    'flowering_days_min': [56, 200, 49, 63],  # 200 days is impossible
+    'flowering_days_max': [70, 250, 63, 70],  # 250 days is impossible
+    'sativa_percentage': [60, 70, 50, 60],
+    'indica_percentage': [40, 20, 50, 40],  # Second strain: 70+20=90% (not 100%)
+    'confidence_score': [4, 2, 5, 3]
+}
+
+def main():
+    """Example usage of the Cannabis Outlier Detector"""
+    
+    df = pd.DataFrame(_SAMPLE_DATA)
+    
+    detector = CannabisOutlierDetector()
+    outlier_results = detector.detect_outliers(df)
+    
+    # Generate and print report
+    report = detector.generate_report(outlier_results)
+    print(report)
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
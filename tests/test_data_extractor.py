@@ -0,0 +1,64 @@
+#!/usr/bin/env python3
+"""
+Regression tests for Bronze layer data extraction
+"""
+
+import importlib.util
+import os
+import sys
+import unittest
+
+EXTRACTOR_PATH = os.path.join(os.path.dirname(__file__), '..', 'src', 'ingestion', 'data_extractor.py')
+
+def load_extractor(name, use_re2):
+    """A fresh copy of the data_extractor module, with or without RE2 importable"""
+    saved = sys.modules.pop('re2', None)
+    if not use_re2:
+        sys.modules['re2'] = None  # makes `import re2` raise ImportError
+    try:
+        spec = importlib.util.spec_from_file_location(name, EXTRACTOR_PATH)
+        module = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(module)
+    finally:
+        sys.modules.pop('re2', None)
+        if saved is not None:
+            sys.modules['re2'] = saved
+    return module
+
+try:
+    import re2
+except ImportError:
+    re2 = None
+
+
+class NonBreakingSpaceTests(unittest.TestCase):
+    """Pattern extraction on pages that space their labels with &nbsp;"""
+    
+    PAGES = {
+        '<p>Flowering&nbsp;time: 9 weeks</p>': {'flowering_time_raw': '9 weeks'},
+        '<p>THC:&nbsp;\n22%</p>': {'thc_content_raw': '22%'},
+        '<p>CBD&nbsp;content:&nbsp;1%</p><p>Height:&nbsp;120&nbsp;cm</p>': {
+            'cbd_content_raw': '1% Height:\xa0120\xa0cm', 'height_raw': '120\xa0cm'
+        }
+    }
+    
+    def raw_values(self, module, html):
+        extracted = module.CannabisDataExtractor().extract_strain_data(html, 'https://example.com/strain')
+        return {key: value for key, value in extracted['raw_data'].items() if key.endswith('_raw')}
+    
+    def test_stdlib_engine(self):
+        module = load_extractor('data_extractor_re', use_re2=False)
+        for html, expected in self.PAGES.items():
+            self.assertEqual(self.raw_values(module, html), expected, html)
+    
+    @unittest.skipIf(re2 is None, "RE2 is not installed")
+    def test_re2_matches_stdlib_engine(self):
+        with_re2 = load_extractor('data_extractor_re2', use_re2=True)
+        without_re2 = load_extractor('data_extractor_re', use_re2=False)
+        self.assertIsNotNone(with_re2.re2)
+        for html in self.PAGES:
+            self.assertEqual(self.raw_values(with_re2, html), self.raw_values(without_re2, html), html)
+
+
+if __name__ == '__main__':
+    unittest.main()
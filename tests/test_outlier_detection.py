@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+"""
+Regression tests for the cannabis strain outlier detector
+"""
+
+import os
+import sys
+import unittest
+
+import pandas as pd
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src', 'utils'))
+
+from outlier_detection import CannabisOutlierDetector
+
+
+class NullableColumnTests(unittest.TestCase):
+    """Nullable (Int64/Float64/UInt8) rule columns with missing values"""
+    
+    def setUp(self):
+        self.df = pd.DataFrame({
+            'strain_name': ['Low', 'Missing', 'High'],
+            'thc_percentage': pd.array([10, None, 50], dtype='Int64'),
+            'thc_percentage_max': pd.array([60.0, None, 20.0], dtype='Float64'),
+            'cbd_percentage_max': pd.array([20, 1, None], dtype='UInt8'),
+            'sativa_percentage': pd.array([50, None, 10], dtype='Int64'),
+            'indica_percentage': pd.array([50, 10, 10], dtype='Int64')
+        })
+    
+    def test_missing_values_never_violate(self):
+        results = CannabisOutlierDetector().detect_outliers(self.df)
+        
+        flagged = [(outlier['field'], outlier['row_index']) for outlier in results['critical_outliers']]
+        self.assertEqual(flagged, [('thc_percentage_max', 0), ('thc_percentage', 2)])
+        combinations = [outlier['violation_type'] for outlier in results['impossible_values']]
+        self.assertEqual(combinations, ['genetics_not_100_percent', 'high_thc_and_cbd'])
+    
+    def test_chunked_matches_in_memory(self):
+        in_memory = CannabisOutlierDetector().detect_outliers(self.df)
+        chunked = CannabisOutlierDetector().detect_outliers_iter([self.df.iloc[:1], self.df.iloc[1:]])
+        
+        self.assertEqual(chunked['summary'], in_memory['summary'])
+
+
+class ResultCacheTests(unittest.TestCase):
+    """Repeated detection on an unchanged table"""
+    
+    def test_cached_results_are_not_shared(self):
+        df = pd.DataFrame({
+            'strain_name': ['Too Strong', 'Uneven'],
+            'thc_percentage': [50, 20],
+            'thc_percentage_min': [18, 30],
+            'thc_percentage_max': [24, 20]
+        })
+        detector = CannabisOutlierDetector()
+        
+        first = detector.detect_outliers(df)
+        first['critical_outliers'][0]['value'] = 'EDITED'
+        first['impossible_values'][0]['fields'].append('EDITED')
+        second = detector.detect_outliers(df)
+        
+        self.assertEqual(second['critical_outliers'][0]['value'], 50)
+        self.assertEqual(second['impossible_values'][0]['fields'], ['thc_percentage_min', 'thc_percentage_max'])
+
+
+if __name__ == '__main__':
+    unittest.main()